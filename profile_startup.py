@@ -0,0 +1,45 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+# Profiles the startup of the background governor: the import time of `main_loop` (as reported by `-X importtime`),
+# the modules with the largest own import time, and the resident memory after the imports.
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+TOP_MODULES = 15
+HEAVY_MODULES = ('tkinter', 'PIL.ImageTk', 'ui.settings')
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+CHILD_SCRIPT = f"""
+import sys
+import psutil
+import main_loop
+print(psutil.Process().memory_info().rss)
+print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))
+"""
+
+env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC, os.environ.get('PYTHONPATH')])))
+
+with tempfile.TemporaryDirectory() as cwd:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD_SCRIPT],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True
+    )
+
+imports: list[tuple[int, int, str]] = []
+
+for line in result.stderr.splitlines():
+    if match := IMPORT_TIME_LINE.match(line):
+        self_us, cumulative_us, _, name = match.groups()
+        imports.append((int(self_us), int(cumulative_us), name))
+
+rss, heavy = result.stdout.splitlines()[-2:]
+main_loop_us = next(cumulative_us for _, cumulative_us, name in imports if name == 'main_loop')
+
+print(f"import main_loop: {main_loop_us / 1000:.1f} ms, modules: {len(imports)}, RSS: {int(rss) / 2 ** 20:.1f} MiB")
+print(f"UI modules imported at startup: {heavy or 'none'}")
+print(f"\nTop {TOP_MODULES} modules by own import time:")
+
+for self_us, cumulative_us, name in sorted(imports, reverse=True)[:TOP_MODULES]:
+    print(f"{self_us / 1000:8.1f} ms {cumulative_us / 1000:8.1f} ms  {name}")
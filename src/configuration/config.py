@@ -2,7 +2,10 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from configuration.cpu_throttling import CpuThrottling
+from configuration.profile import Profile
 from configuration.rule import ProcessRule, ServiceRule
+from configuration.thread_rule import ThreadRule
 
 
 class Config(BaseModel):
@@ -33,3 +36,25 @@ class Config(BaseModel):
     """
     A list of Rule objects that specify how application manages services based on user-defined rules.
     """
+
+    profiles: list[Profile] = Field(default_factory=list)
+    """
+    A list of rule profiles that are active while their trigger processes are running.
+    """
+
+    threadRules: list[ThreadRule] = Field(default_factory=list)
+    """
+    A list of rules for individual threads of processes. A thread is handled by the first matching rule.
+    """
+
+    rulePacksDirectory: Optional[str] = Field(default=None)
+    """
+    The directory with rule pack files (`*.json`), relative to the configuration file.
+    This field can be None if rule packs are not used.
+    """
+
+    cpuThrottling: Optional[CpuThrottling] = Field(default=None)
+    """
+    The settings of the temporary demotion of processes that use too much CPU time.
+    This field can be None if the demotion is disabled.
+    """
@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field
+
+from enums.priority import PriorityStr
+
+
+class CpuThrottling(BaseModel):
+    """
+    The CpuThrottling class describes the temporary demotion of processes that use too much CPU time (CPU hogs).
+
+    Only processes whose priority is not set by a rule are demoted.
+    """
+
+    cpuShareThreshold: float = Field(default=25.0, gt=0, le=100)
+    """
+    The share of the total CPU time of all cores, in percent, above which a process is demoted.
+    """
+
+    restoreShareThreshold: float = Field(default=5.0, ge=0, le=100)
+    """
+    The share of the total CPU time of all cores, in percent, below which a demoted process gets its priority back.
+    """
+
+    windowSeconds: float = Field(default=5.0, gt=0)
+    """
+    The length of the sliding window, in seconds, over which the CPU share of a process is measured.
+    """
+
+    minDemotionSeconds: float = Field(default=10.0, ge=0)
+    """
+    The minimum time, in seconds, a process stays demoted.
+    """
+
+    demotedPriority: PriorityStr = Field(default=PriorityStr.IDLE)
+    """
+    The priority of a demoted process. Processes that already have this or a lower priority are not demoted.
+    """
@@ -3,23 +3,34 @@ from typing import Optional
 from pydantic import PlainSerializer, WithJsonSchema, BeforeValidator
 from typing_extensions import Annotated
 
-from util.cpu import parse_affinity, format_affinity
+from util.cpu import parse_affinity_mask, format_affinity, format_affinity_mask, cores_to_mask, AffinityMask
 
 
-def __to_list(value) -> Optional[list[int]]:
+def __to_mask(value) -> Optional[AffinityMask]:
+    if value is None:
+        return None
+
+    if isinstance(value, int):
+        # A number in the configuration would be silently taken as a bitmask, so only strings and core lists are valid.
+        raise ValueError("must be a string of cores, such as `0-3;8`")
+
     if isinstance(value, list):
-        return value
+        # Formatting checks the cores against the CPU cores of the machine, like parsing a string does.
+        return cores_to_mask(value) if format_affinity(value) else None
 
     if not value.strip():
         return None
 
-    return parse_affinity(value)
+    return parse_affinity_mask(value)
 
 
 def __to_str(value) -> Optional[str]:
     if not value:
         return None
 
+    if isinstance(value, int):
+        return format_affinity_mask(value)
+
     if isinstance(value, list):
         return format_affinity(value)
 
@@ -27,8 +38,11 @@ def __to_str(value) -> Optional[str]:
 
 
 Affinity = Annotated[
-    Optional[list[int]],
-    BeforeValidator(__to_list),
+    Optional[AffinityMask],
+    BeforeValidator(__to_mask),
     PlainSerializer(__to_str, return_type=str),
     WithJsonSchema({'type': 'string'}, mode='serialization'),
 ]
+"""
+CPU core affinity, which is a string such as `0-3;8` in the configuration and the UI, and a bitmask in the engine.
+"""
@@ -0,0 +1,19 @@
+from typing import Optional
+
+from pydantic import BeforeValidator
+from typing_extensions import Annotated
+
+from util.system_load import parse_condition, format_condition
+
+
+def __normalize(value) -> Optional[str]:
+    if value is None or not value.strip():
+        return None
+
+    return format_condition(parse_condition(value))
+
+
+Condition = Annotated[Optional[str], BeforeValidator(__normalize)]
+"""
+A condition on the system load, such as `cpu>80;memory>90`, which is validated and normalized when it is loaded.
+"""
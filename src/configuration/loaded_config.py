@@ -0,0 +1,84 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+from pydantic import ValidationError
+from pydantic_core import ErrorDetails
+
+from configuration.config import Config
+from configuration.rule_pack import RulePack
+from configuration.rules_diff import RuleKey
+from util.file_watcher import FileSignature
+
+RuleLocation = tuple[str, int]
+"""
+The location of a rule in the configuration: the name of the rule list (e.g. `processRules`) and the index in it.
+"""
+
+
+@dataclass
+class LoadedConfig:
+    """
+    The LoadedConfig class represents the result of validating the content of the configuration file.
+    """
+
+    content_hash: bytes
+    """
+    The hash of the validated content.
+    """
+
+    config: Optional[Config] = None
+    """
+    The configuration, or None if the content is invalid.
+    """
+
+    error: Optional[ValidationError] = None
+    """
+    The validation error, or None if the content is valid.
+    """
+
+    rule_errors: dict[RuleLocation, list[ErrorDetails]] = field(default_factory=dict)
+    """
+    The validation errors of the rules by their location.
+    """
+
+    rule_keys: Optional[list[RuleKey]] = None
+    """
+    The content keys of the rules in matching order, or None if they have not been computed yet.
+    """
+
+
+@dataclass
+class LoadedRulePack:
+    """
+    The LoadedRulePack class represents a validated rule pack file.
+    """
+
+    path: str
+    """
+    The absolute path to the rule pack file.
+    """
+
+    signature: Optional[FileSignature]
+    """
+    The signature of the file when it was last read.
+    """
+
+    content_hash: bytes
+    """
+    The hash of the validated content.
+    """
+
+    pack: RulePack
+    """
+    The rule pack.
+    """
+
+    rule_keys: list[RuleKey]
+    """
+    The content keys of the rules in matching order: service rules first, then process rules.
+    """
+
+    generation: int
+    """
+    The generation of the rule packs in which this content of the file was loaded.
+    """
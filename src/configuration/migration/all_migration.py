@@ -1,5 +1,3 @@
-import copy
-
 from configuration.migration.base import BaseMigration
 from configuration.migration.m0_rules_to_split_rules_config import MigrationRules2SplitRulesConfig
 from configuration.migration.m1_new_fields_in_rule import NewFieldsInRule
@@ -17,48 +15,62 @@ MIGRATIONS: list[type[BaseMigration]] = [
 List of migration classes to be executed in order.
 """
 
+LATEST_VERSION: int = MIGRATIONS[-1].get_target_version()
+"""
+The version of the configuration after all migrations.
+"""
+
 
 def run_all_migration():
     """
     Runs all necessary migrations on the configuration.
-    Creates a backup before migration, applies each migration in order,
+    Creates a backup before migration, applies the pending migrations in order,
     logs progress, and saves the updated configuration if successful.
     Shows an error and stops if any migration fails.
+
+    If the version read from the configuration file is already current, the file is not parsed at all.
+    The configuration is migrated in place and saved only after all migrations have succeeded, so a failed migration
+    leaves the file untouched.
     """
 
+    if ConfigService.read_config_version() == LATEST_VERSION:
+        return
+
     config: dict = ConfigService.load_config_raw()
-    need_migrate = any(migration.should_migrate(config) for migration in MIGRATIONS)
+    pending = [migration for migration in MIGRATIONS if migration.should_migrate(config)]
 
-    if not need_migrate:
+    if not pending:
         return
 
     LOG.info(f"Creating backup of the current configuration before migration...")
     ConfigService.backup_config()
 
-    has_error = False
-
-    for migration in MIGRATIONS:
-        migration_name = migration.__name__
-
-        try:
-            if not migration.should_migrate(copy.deepcopy(config)):
-                continue
+    migration_name = None
 
+    try:
+        for migration in pending:
+            migration_name = migration.__name__
             LOG.info(f"[{migration_name}] Starting migration...")
+            config = migration.migrate(config)
+
+        for rule in config.get('processRules', []):
+            for migration in pending:
+                migration_name = migration.__name__
+                migration.migrate_process_rule(rule)
+
+        for rule in config.get('serviceRules', []):
+            for migration in pending:
+                migration_name = migration.__name__
+                migration.migrate_service_rule(rule)
+    except Exception as e:
+        LOG.exception(f"[{migration_name}] Migration failed.")
+        show_error(f"Migration `{migration_name}` failed: \n{str(e)}")
+        return
 
-            migrated_config = migration.migrate(copy.deepcopy(config))
-            migrated_config['version'] = migration.get_target_version()
-
-            LOG.info(f"[{migration_name}] Migration completed to version {migrated_config['version']}.")
-            config = migrated_config
-        except Exception as e:
-            has_error = True
-            LOG.exception(f"[{migration_name}] Migration failed.")
-            show_error(f"Migration `{migration_name}` failed: \n{str(e)}")
-            break
+    config['version'] = pending[-1].get_target_version()
+    LOG.info(f"Migration completed to version {config['version']}.")
 
-    if not has_error:
-        ConfigService.save_config_raw(config)
+    ConfigService.save_config_raw(config)
 
 
 if __name__ == '__main__':
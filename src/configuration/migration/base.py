@@ -4,28 +4,55 @@ from pydantic.config import JsonDict
 
 
 class BaseMigration(ABC):
-    @staticmethod
-    @abstractmethod
-    def should_migrate(config: JsonDict) -> bool:
+    """
+    A migration of the configuration to its target version.
+
+    A migration consists of a configuration-level step (`migrate`) and optional per-rule steps
+    (`migrate_process_rule`, `migrate_service_rule`). The configuration-level steps of all pending migrations run first,
+    after which the rules are migrated in a single pass, so a configuration-level step must not depend on the per-rule
+    steps of earlier migrations. All steps modify the configuration in place.
+    """
+
+    @classmethod
+    def should_migrate(cls, config: JsonDict) -> bool:
         """
         Checks if migration is necessary.
 
         :param config: The current configuration dictionary.
         :return: True if migration is required, otherwise False.
         """
-        pass
+        version = config.get('version')
+        return version is None or version < cls.get_target_version()
 
     @staticmethod
     @abstractmethod
     def migrate(config: JsonDict) -> JsonDict:
         """
-        Performs the migration and returns the updated configuration.
+        Performs the configuration-level migration and returns the updated configuration.
 
         :param config: The current configuration dictionary.
         :return: Updated configuration after migration.
         """
         pass
 
+    @staticmethod
+    def migrate_process_rule(rule: JsonDict):
+        """
+        Migrates a single process rule in place.
+
+        :param rule: The process rule dictionary.
+        """
+        pass
+
+    @staticmethod
+    def migrate_service_rule(rule: JsonDict):
+        """
+        Migrates a single service rule in place.
+
+        :param rule: The service rule dictionary.
+        """
+        pass
+
     @staticmethod
     @abstractmethod
     def get_target_version() -> int:
@@ -10,10 +10,6 @@ class MigrationRules2SplitRulesConfig(BaseMigration):
     def get_target_version() -> int:
         return 1
 
-    @staticmethod
-    def should_migrate(config: JsonDict) -> bool:
-        return 'version' not in config or config['version'] is None
-
     @staticmethod
     def migrate(config: JsonDict) -> Optional[JsonDict]:
         if 'rules' not in config:
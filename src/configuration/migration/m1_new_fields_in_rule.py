@@ -12,17 +12,15 @@ class NewFieldsInRule(BaseMigration):
     def get_target_version() -> int:
         return 2
 
-    @staticmethod
-    def should_migrate(config: JsonDict) -> bool:
-        return config['version'] == 1
-
     @staticmethod
     def migrate(config: JsonDict) -> Optional[JsonDict]:
-        for rule in config.get('processRules', []):
-            rule['selectorBy'] = SelectorType.NAME.value
-            rule['force'] = BoolStr.NO.value
+        return config
 
-        for rule in config.get('serviceRules', []):
-            rule['force'] = BoolStr.NO.value
+    @staticmethod
+    def migrate_process_rule(rule: JsonDict):
+        rule['selectorBy'] = SelectorType.NAME.value
+        rule['force'] = BoolStr.NO.value
 
-        return config
+    @staticmethod
+    def migrate_service_rule(rule: JsonDict):
+        rule['force'] = BoolStr.NO.value
@@ -1,4 +1,3 @@
-import itertools
 from typing import Optional
 
 from pydantic.config import JsonDict
@@ -11,17 +10,18 @@ class RemoveHighIoPriorityAndLogging(BaseMigration):
     def get_target_version() -> int:
         return 3
 
-    @staticmethod
-    def should_migrate(config: JsonDict) -> bool:
-        return config['version'] == 2
-
     @staticmethod
     def migrate(config: JsonDict) -> Optional[JsonDict]:
-        for rule in itertools.chain(config.get('processRules', []), config.get('serviceRules', [])):
-            if rule.get('ioPriority') == 'High':
-                del rule['ioPriority']
-
         if 'logging' in config:
             del config['logging']
 
         return config
+
+    @staticmethod
+    def migrate_process_rule(rule: JsonDict):
+        if rule.get('ioPriority') == 'High':
+            del rule['ioPriority']
+
+    @staticmethod
+    def migrate_service_rule(rule: JsonDict):
+        RemoveHighIoPriorityAndLogging.migrate_process_rule(rule)
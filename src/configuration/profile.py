@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+
+from configuration.rule import ProcessRule, ServiceRule
+from enums.selector import SelectorType
+
+
+class Profile(BaseModel):
+    """
+    The Profile class represents a named set of rules that is active while a trigger process is running.
+    """
+
+    name: str
+    """
+    The name of the profile, used in the log.
+    """
+
+    triggerBy: SelectorType = Field(default=SelectorType.NAME)
+    """
+    Determines how the trigger is interpreted, as the selector of process rules.
+    """
+
+    trigger: str
+    """
+    The name, pattern or path of the process that activates the profile while it is running.
+    """
+
+    processRules: list[ProcessRule] = Field(default_factory=list)
+    """
+    A list of rules for processes, matched before the process rules of the configuration while the profile is active.
+    """
+
+    serviceRules: list[ServiceRule] = Field(default_factory=list)
+    """
+    A list of rules for services, matched before the rules of the configuration while the profile is active.
+    """
@@ -3,6 +3,7 @@ from typing import Optional
 from pydantic import BaseModel, Field
 
 from configuration.handler.affinity import Affinity
+from configuration.handler.condition import Condition
 from enums.bool import BoolStr
 from enums.io_priority import IOPriorityStr
 from enums.priority import PriorityStr
@@ -47,11 +48,61 @@ class ProcessRule(BaseModel):
         default=None,
         title="Affinity",
         description="Sets the **CPU core affinity** for the __process__, defining which CPU cores are allowed for execution.\n\n"
-                    "**Format:** range `0-3`, specific cores `0;2;4`, combination `1;3-5`.",
+                    "**Format:** range `0-3`, specific cores `0;2;4`, combination `1;3-5`.\n\n"
+                    "**Topology:** `physical`, `smt:N`, `node:N`, `perf-cores`, `eff-cores`, e.g. `node:0;physical`.",
         justify_ui="left",
         width_ui=200
     )
 
+    isolate: BoolStr = Field(
+        default=BoolStr.NO,
+        title="Isolate",
+        description="**Reserves** the cores of the __Affinity__ for the __process__: while it is running, all other processes are moved off these cores.\n\n"
+                    "**Possible values:**\n"
+                    "- `Y` to reserve the cores (requires __Affinity__);\n"
+                    "- `N` to share the cores with other processes."
+    )
+
+    cpuLimit: Optional[float] = Field(
+        gt=0,
+        le=100,
+        default=None,
+        title="CPU Limit",
+        description="Sets a **hard cap** on the CPU time of the __process__, in __percent__ of all CPU cores.\n"
+                    "All processes matched by this rule share the cap.\n\n"
+                    "**Examples:** `25` or `2.5`."
+    )
+
+    cpuWeight: Optional[int] = Field(
+        ge=1,
+        le=9,
+        default=None,
+        title="CPU Weight",
+        description="Sets the **relative share** of CPU time of the __process__ when the CPU is busy, from `1` to `9`.\n"
+                    "All processes matched by this rule share the weight, the default weight of other processes is `5`.\n\n"
+                    "Ignored if __CPU Limit__ is set."
+    )
+
+    dutyCycle: Optional[float] = Field(
+        gt=0,
+        lt=100,
+        default=None,
+        title="Duty Cycle",
+        description="Caps the CPU usage of the __process__ by **suspending** it periodically, in __percent__ of the time it may run.\n"
+                    "Unlike a priority, this also limits the __process__ when the CPU is otherwise idle.\n\n"
+                    "**Examples:** `20` lets the __process__ run for 20 ms of every 100 ms."
+    )
+
+    condition: Condition = Field(
+        default=None,
+        title="Condition",
+        description="Applies the rule to the __process__ only while the **system load** meets the condition.\n\n"
+                    "**Metrics:** `cpu` (total CPU usage, %), `memory` (used memory, %), `availableMemory` (MB).\n"
+                    "**Format:** `metric>value` or `metric<value`, several conditions separated by `;` must all hold.\n"
+                    "**Examples:** `cpu>80` or `availableMemory<2048;cpu>50`.",
+        justify_ui="left"
+    )
+
     force: BoolStr = Field(
         default=BoolStr.NO,
         title="Force",
@@ -61,6 +112,16 @@ class ProcessRule(BaseModel):
                     "- `N` for one-time application.",
     )
 
+    forceInterval: Optional[float] = Field(
+        gt=0,
+        default=None,
+        title="Force Interval",
+        description="Specifies how often, in __seconds__, the settings of a **forced** rule are re-checked for the __process__.\n\n"
+                    "**Possible values:**\n"
+                    "- If not specified, the settings are re-checked with every rule application;\n"
+                    "- Positive values set an own re-check interval for this rule, e.g. `0.25` or `10`."
+    )
+
     delay: Optional[int] = Field(
         gt=0,
         default=0,
@@ -100,11 +161,61 @@ class ServiceRule(BaseModel):
         default=None,
         title="Affinity",
         description="Sets the **CPU core affinity** for the __service__, defining which CPU cores are allowed for execution.\n\n"
-                    "**Format:** range `0-3`, specific cores `0;2;4`, combination `1;3-5`.",
+                    "**Format:** range `0-3`, specific cores `0;2;4`, combination `1;3-5`.\n\n"
+                    "**Topology:** `physical`, `smt:N`, `node:N`, `perf-cores`, `eff-cores`, e.g. `node:0;physical`.",
         justify_ui="left",
         width_ui=200
     )
 
+    isolate: BoolStr = Field(
+        default=BoolStr.NO,
+        title="Isolate",
+        description="**Reserves** the cores of the __Affinity__ for the __service__: while it is running, all other processes are moved off these cores.\n\n"
+                    "**Possible values:**\n"
+                    "- `Y` to reserve the cores (requires __Affinity__);\n"
+                    "- `N` to share the cores with other processes."
+    )
+
+    cpuLimit: Optional[float] = Field(
+        gt=0,
+        le=100,
+        default=None,
+        title="CPU Limit",
+        description="Sets a **hard cap** on the CPU time of the __service__, in __percent__ of all CPU cores.\n"
+                    "All services matched by this rule share the cap.\n\n"
+                    "**Examples:** `25` or `2.5`."
+    )
+
+    cpuWeight: Optional[int] = Field(
+        ge=1,
+        le=9,
+        default=None,
+        title="CPU Weight",
+        description="Sets the **relative share** of CPU time of the __service__ when the CPU is busy, from `1` to `9`.\n"
+                    "All services matched by this rule share the weight, the default weight of other processes is `5`.\n\n"
+                    "Ignored if __CPU Limit__ is set."
+    )
+
+    dutyCycle: Optional[float] = Field(
+        gt=0,
+        lt=100,
+        default=None,
+        title="Duty Cycle",
+        description="Caps the CPU usage of the __service__ by **suspending** it periodically, in __percent__ of the time it may run.\n"
+                    "Unlike a priority, this also limits the __service__ when the CPU is otherwise idle.\n\n"
+                    "**Examples:** `20` lets the __service__ run for 20 ms of every 100 ms."
+    )
+
+    condition: Condition = Field(
+        default=None,
+        title="Condition",
+        description="Applies the rule to the __service__ only while the **system load** meets the condition.\n\n"
+                    "**Metrics:** `cpu` (total CPU usage, %), `memory` (used memory, %), `availableMemory` (MB).\n"
+                    "**Format:** `metric>value` or `metric<value`, several conditions separated by `;` must all hold.\n"
+                    "**Examples:** `cpu>80` or `availableMemory<2048;cpu>50`.",
+        justify_ui="left"
+    )
+
     force: BoolStr = Field(
         default=BoolStr.NO,
         title="Force",
@@ -114,6 +225,16 @@ class ServiceRule(BaseModel):
                     "- `N` for one-time application.",
     )
 
+    forceInterval: Optional[float] = Field(
+        gt=0,
+        default=None,
+        title="Force Interval",
+        description="Specifies how often, in __seconds__, the settings of a **forced** rule are re-checked for the __service__.\n\n"
+                    "**Possible values:**\n"
+                    "- If not specified, the settings are re-checked with every rule application;\n"
+                    "- Positive values set an own re-check interval for this rule, e.g. `0.25` or `10`."
+    )
+
     delay: Optional[int] = Field(
         gt=0,
         default=0,
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+
+from configuration.rule import ProcessRule, ServiceRule
+
+
+class RulePack(BaseModel):
+    """
+    The RulePack class represents a file with additional rules, included from the rule packs directory.
+    """
+
+    processRules: list[ProcessRule] = Field(default_factory=list)
+    """
+    A list of rules for processes, matched after the process rules of the main configuration.
+    """
+
+    serviceRules: list[ServiceRule] = Field(default_factory=list)
+    """
+    A list of rules for services, matched after the service rules of the main configuration.
+    """
@@ -0,0 +1,49 @@
+from dataclasses import dataclass, field
+
+from configuration.profile import Profile
+from configuration.rule import ProcessRule, ServiceRule
+
+RuleKey = str
+"""
+The content key of a rule. Rules with the same type and the same field values have the same key.
+"""
+
+
+def rule_key(rule: ProcessRule | ServiceRule) -> RuleKey:
+    """
+    Returns the content key of the rule.
+    """
+    return f"{type(rule).__name__}:{rule.model_dump_json(exclude_none=True)}"
+
+
+@dataclass
+class RulesDiff:
+    """
+    The RulesDiff class represents the difference between the rules of two configurations, compared by content.
+
+    A modified rule appears as removed with its old content and added with its new content.
+    """
+
+    keys: list[RuleKey] = field(default_factory=list)
+    """
+    The keys of all rules of the new configuration in matching order: service rules first, then process rules.
+    """
+
+    profiles: list[tuple[Profile, list[RuleKey]]] = field(default_factory=list)
+    """
+    The profiles of the new configuration with the keys of their rules in matching order.
+    The rules of all profiles are compiled in advance, whether the profiles are active or not.
+    """
+
+    added: dict[RuleKey, ProcessRule | ServiceRule] = field(default_factory=dict)
+    """
+    The rules present in the new configuration only.
+    """
+
+    removed: set[RuleKey] = field(default_factory=set)
+    """
+    The keys of the rules present in the old configuration only.
+    """
+
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed)
@@ -0,0 +1,39 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from configuration.handler.affinity import Affinity
+from enums.selector import SelectorType
+from enums.thread_priority import ThreadPriorityStr
+
+
+class ThreadRule(BaseModel):
+    """
+    The ThreadRule class represents a rule for the threads of the processes matched by its selector.
+    """
+
+    selectorBy: SelectorType = Field(default=SelectorType.NAME)
+    """
+    Determines how the process selector is interpreted, as in process rules.
+    """
+
+    selector: str
+    """
+    The name, pattern or path of the process whose threads this rule applies to.
+    """
+
+    threadSelector: str
+    """
+    The thread to which this rule applies: `#N` for the N-th thread of the process, where `#0` is usually the main
+    thread, or a pattern of the thread name (description).
+    """
+
+    priority: Optional[ThreadPriorityStr] = Field(default=None)
+    """
+    The priority of the thread relative to the priority of its process.
+    """
+
+    affinity: Optional[Affinity] = Field(default=None)
+    """
+    The CPU cores allowed for the thread, which must be a subset of the affinity of its process.
+    """
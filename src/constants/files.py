@@ -5,3 +5,6 @@ LOCK_FILE_NAME: Final[str] = "pg.lock"
 CONFIG_FILE_NAME: Final[str] = "config.json"
 CONFIG_FILE_ENCODING: Final[str] = "utf-8"
 LOG_FILE_NAME: Final[str] = "logging.txt"
+CONFIG_CACHE_FILE_NAME: Final[str] = "config.cache"
+UPDATE_CHECK_CACHE_FILE_NAME: Final[str] = "update_check.json"
+STATE_FILE_NAME: Final[str] = "state.json"
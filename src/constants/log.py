@@ -1,14 +1,34 @@
+import atexit
 import logging
 import sys
-from logging import StreamHandler, Logger, WARNING
-from logging.handlers import RotatingFileHandler
+from logging import Logger, WARNING, Handler
+from queue import Queue
 from typing import Final
 
 from configuration.logs import Logs
 from constants.files import LOG_FILE_NAME
+from util.aggregated_log import AggregatedLog
+from util.log_queue import BatchStreamHandler, BatchRotatingFileHandler, DroppingQueueHandler, BatchQueueListener
 
 logging.addLevelName(WARNING, 'WARN')
 
+LOG_QUEUE_SIZE: Final[int] = 10000
+"""
+The maximum number of log records waiting to be written by the background writer. When the queue is full,
+new records are dropped and counted.
+"""
+
+LOG_BATCH_SIZE: Final[int] = 500
+"""
+The maximum number of log records written by the background writer before the log handlers are flushed.
+"""
+
+REPEATED_EVENTS_WINDOW_SECONDS: Final[int] = 60
+"""
+The time window over which repeated rule events for the same rule, executable and parameter are collapsed
+into one summary line.
+"""
+
 
 def __log_setup() -> Logger:
     """
@@ -16,6 +36,9 @@ def __log_setup() -> Logger:
 
     Retrieves the logging configuration from the `ConfigService` and sets up the logging handlers and formatters
     accordingly. If the logging configuration is disabled, the function does nothing.
+
+    Records are passed through a bounded queue to a background writer, so the calling thread never waits for
+    disk I/O or log rotation.
     """
 
     log: Logger = logging.getLogger("proc-gov")
@@ -24,24 +47,36 @@ def __log_setup() -> Logger:
     log.setLevel(log_cfg.level_as_int())
 
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers: list[Handler] = []
 
-    console_handler = StreamHandler(sys.stdout)
+    console_handler = BatchStreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    log.addHandler(console_handler)
+    handlers.append(console_handler)
+
+    if log_cfg.enable:
+        file_handler = BatchRotatingFileHandler(
+            LOG_FILE_NAME,
+            maxBytes=log_cfg.maxBytes,
+            backupCount=log_cfg.backupCount,
+            encoding='utf-8',
+        )
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
 
-    if not log_cfg.enable:
-        return log
+    queue_handler = DroppingQueueHandler(Queue(LOG_QUEUE_SIZE))
+    log.addHandler(queue_handler)
 
-    file_handler = RotatingFileHandler(
-        LOG_FILE_NAME,
-        maxBytes=log_cfg.maxBytes,
-        backupCount=log_cfg.backupCount,
-        encoding='utf-8',
-    )
-    file_handler.setFormatter(formatter)
-    log.addHandler(file_handler)
+    listener = BatchQueueListener(log, queue_handler, handlers, LOG_BATCH_SIZE)
+    listener.start()
+    atexit.register(listener.stop)
 
     return log
 
 
 LOG: Final[logging.Logger] = __log_setup()
+
+RULE_EVENTS_LOG: Final[AggregatedLog] = AggregatedLog(LOG, REPEATED_EVENTS_WINDOW_SECONDS)
+"""
+Log for events of applying rules, which collapses repeats of the same event into summary lines.
+"""
+atexit.register(RULE_EVENTS_LOG.flush, True)
@@ -1,4 +1,3 @@
-from tkinter import LEFT, RIGHT
 from typing import Final
 
 UI_PADDING = 10
@@ -6,8 +5,9 @@ RC_WIN_SIZE = (1280, 768)
 COLUMN_WIDTH_WITH_ICON = 45
 TRIM_LENGTH_OF_ITEM_IN_CONTEXT_MENU = 128
 
-LEFT_PACK = dict(side=LEFT, padx=(0, UI_PADDING))
-RIGHT_PACK = dict(side=RIGHT, padx=(UI_PADDING, 0))
+# The values of `tkinter.LEFT` and `tkinter.RIGHT`, so that the tray-only startup does not import tkinter.
+LEFT_PACK = dict(side='left', padx=(0, UI_PADDING))
+RIGHT_PACK = dict(side='right', padx=(UI_PADDING, 0))
 
 COLUMN_TITLE_PADDING = 30
 ERROR_ROW_COLOR = "#ffcdd2"
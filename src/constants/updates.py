@@ -2,3 +2,13 @@ from typing import Final
 
 API_UPDATE_URL: Final[str] = "https://api.github.com/repos/SystemXFiles/process-governor/releases/latest"
 UPDATE_URL: Final[str] = "https://github.com/SystemXFiles/process-governor/releases/latest"
+
+UPDATE_CHECK_TIMEOUT_SECONDS: Final[float] = 5
+"""
+The timeout of the request for the latest release.
+"""
+
+UPDATE_CHECK_CACHE_TTL_SECONDS: Final[int] = 24 * 60 * 60
+"""
+How long the result of the last update check is reused by the check at startup.
+"""
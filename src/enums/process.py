@@ -5,3 +5,4 @@ class ProcessParameter(StrEnum):
     AFFINITY = "affinity"
     NICE = "priority"
     IONICE = "I/O priority"
+    CPU_RATE = "CPU rate"
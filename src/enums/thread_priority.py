@@ -0,0 +1,24 @@
+from enum import StrEnum
+from typing import Final
+
+
+class ThreadPriorityStr(StrEnum):
+    IDLE = 'Idle'
+    LOWEST = 'Lowest'
+    BELOW_NORMAL = 'BelowNormal'
+    NORMAL = 'Normal'
+    ABOVE_NORMAL = 'AboveNormal'
+    HIGHEST = 'Highest'
+    TIME_CRITICAL = 'TimeCritical'
+
+
+to_thread_priority: Final[dict[ThreadPriorityStr, int]] = {
+    ThreadPriorityStr.IDLE: -15,
+    ThreadPriorityStr.LOWEST: -2,
+    ThreadPriorityStr.BELOW_NORMAL: -1,
+    ThreadPriorityStr.NORMAL: 0,
+    ThreadPriorityStr.ABOVE_NORMAL: 1,
+    ThreadPriorityStr.HIGHEST: 2,
+    ThreadPriorityStr.TIME_CRITICAL: 15,
+    None: None
+}
@@ -1,5 +1,5 @@
 import os
-from time import sleep
+from time import monotonic
 from typing import Optional
 
 import psutil
@@ -7,15 +7,19 @@ from psutil._pswindows import Priority, IOPriority
 from pystray._win32 import Icon
 
 from configuration.config import Config
+from configuration.loaded_config import LoadedRulePack
 from configuration.migration.all_migration import run_all_migration
+from configuration.rules_diff import RulesDiff
 from constants.app_info import APP_NAME
 from constants.files import LOG_FILE_NAME
 from constants.log import LOG
-from constants.threads import THREAD_SETTINGS, THREAD_TRAY
+from constants.threads import THREAD_SETTINGS, THREAD_TRAY, THREAD_STARTUP_UPDATE_CHECK
 from constants.ui import SETTINGS_TITLE
 from service.config_service import ConfigService
+from service.cpu_throttling_service import CpuThrottlingService
+from service.duty_cycle_service import DutyCycleService
+from service.rule_packs_service import RulePacksService
 from service.rules_service import RulesService
-from ui.settings import open_settings
 from ui.tray import init_tray
 from util.messages import yesno_error_box, show_error
 from util.scheduler import TaskScheduler
@@ -48,41 +52,70 @@ def main_loop(tray: Icon):
     TaskScheduler.schedule_task(THREAD_TRAY, tray.run)
 
     LOG.info('Application started')
+    RulesService.load_state()
 
     config: Optional[Config] = None
+    packs: list[LoadedRulePack] = []
     is_changed: bool
     last_error_message = None
+    next_apply_time = 0.0
 
-    while TaskScheduler.check_task(THREAD_TRAY):
-        try:
-            config, is_changed = ConfigService.reload_if_changed(config)
+    try:
+        while TaskScheduler.check_task(THREAD_TRAY):
+            try:
+                if monotonic() >= next_apply_time:
+                    prev_config, prev_packs = config, packs
+                    config, is_changed = ConfigService.reload_if_changed(config)
+                    packs, is_packs_changed = RulePacksService.reload_if_changed(config.rulePacksDirectory)
+                    diff: Optional[RulesDiff] = None
+
+                    if is_changed or is_packs_changed:
+                        diff = ConfigService.diff_rules(prev_config, config, prev_packs, packs)
+                        LOG.info(
+                            f"{'Configuration file has' if is_changed else 'Rule packs have'} been modified. "
+                            f"Rules added: {len(diff.added)}, removed: {len(diff.removed)}. "
+                            f"Reapplying rules to processes whose matching rule has changed."
+                        )
+
+                    RulesService.apply_rules(diff, config.cpuThrottling, config.threadRules)
+                else:
+                    RulesService.enforce_due_rules()
 
-            if is_changed:
-                LOG.info("Configuration file has been modified. Reloading all rules to apply changes.")
+                last_error_message = None
+            except KeyboardInterrupt as e:
+                raise e
+            except BaseException as e:
+                if not config:
+                    config = Config()
 
-            RulesService.apply_rules(config, not is_changed)
-            last_error_message = None
-        except KeyboardInterrupt as e:
-            raise e
-        except BaseException as e:
-            if not config:
-                config = Config()
+                current_error_message = str(e)
 
-            current_error_message = str(e)
+                if current_error_message != last_error_message:
+                    LOG.exception("Error in the loop of loading and applying rules.")
 
-            if current_error_message != last_error_message:
-                LOG.exception("Error in the loop of loading and applying rules.")
+                    last_error_message = current_error_message
 
-                last_error_message = current_error_message
+                    if ConfigService.rules_has_error():
+                        show_rules_error_message()
+                    else:
+                        show_abstract_error_message(False)
 
-                if ConfigService.rules_has_error():
-                    show_rules_error_message()
-                else:
-                    show_abstract_error_message(False)
+            now = monotonic()
 
-        sleep(config.ruleApplyIntervalSeconds)
+            if now >= next_apply_time:
+                next_apply_time = now + config.ruleApplyIntervalSeconds
 
-    LOG.info('The application has stopped')
+            next_enforcement_time = RulesService.next_enforcement_time() or next_apply_time
+
+            if ConfigService.wait_for_change(max(0.0, min(next_apply_time, next_enforcement_time) - monotonic())):
+                next_apply_time = monotonic()
+    finally:
+        # Runs on any exit from the loop, including an exception, so demotions and limits are never left behind.
+        RulesService.save_state()
+        RulesService.release_jobs()
+        DutyCycleService.stop()
+        CpuThrottlingService.restore_all()
+        LOG.info('The application has stopped')
 
 
 def start_app():
@@ -97,7 +130,7 @@ def start_app():
         run_all_migration()
         update_startup()
         priority_setup()
-        check_updates(True)
+        TaskScheduler.schedule_task(THREAD_STARTUP_UPDATE_CHECK, check_updates, True)
 
         tray: Icon = init_tray()
         main_loop(tray)
@@ -120,6 +153,7 @@ def show_rules_error_message():
     else:
         message += f"Would you like to open the {SETTINGS_TITLE} to review and correct the rules?"
         if yesno_error_box(message):
+            from ui.settings import open_settings
             open_settings()
 
 
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from re import Pattern
+from typing import Optional
+
+from configuration.rule import ProcessRule, ServiceRule
+from configuration.rules_diff import RuleKey
+from enums.selector import SelectorType
+from model.process import Process
+from util.system_load import LoadCondition, parse_condition
+from util.utils import path_pattern_to_regex
+
+
+@dataclass
+class CompiledRule:
+    """
+    The CompiledRule class represents a rule prepared for matching against processes.
+    """
+
+    key: RuleKey
+    """
+    The content key of the rule.
+    """
+
+    rule: ProcessRule | ServiceRule
+    """
+    The rule as defined in the configuration.
+    """
+
+    regex: Optional[Pattern]
+    """
+    The compiled selector pattern, or None if the selector is empty.
+    """
+
+    conditions: tuple[LoadCondition, ...] = ()
+    """
+    The conditions on the system load that must all hold for the rule to be matched.
+    """
+
+    @classmethod
+    def compile(cls, key: RuleKey, rule: ProcessRule | ServiceRule) -> 'CompiledRule':
+        conditions = parse_condition(rule.condition) if rule.condition else ()
+        return cls(key, rule, path_pattern_to_regex(rule.selector), conditions)
+
+    @property
+    def is_service_rule(self) -> bool:
+        return isinstance(self.rule, ServiceRule)
+
+    def matches(self, process: Process) -> bool:
+        """
+        Checks whether the rule applies to the process.
+        """
+        rule = self.rule
+
+        if isinstance(rule, ServiceRule):
+            value = process.service_name
+
+            if not process.service:
+                return False
+        elif rule.selectorBy == SelectorType.NAME:
+            value = process.process_name
+        elif rule.selectorBy == SelectorType.PATH:
+            value = process.bin_path
+        elif rule.selectorBy == SelectorType.CMDLINE:
+            value = process.cmd_line
+        else:
+            raise ValueError(f"Unknown selector type: {rule.selectorBy}")
+
+        if value is None or self.regex is None:
+            return False
+
+        return rule.selector == value or self.regex.match(value) is not None
@@ -5,6 +5,12 @@ from psutil._pswindows import Priority, IOPriority
 from pydantic import BaseModel, Field, ConfigDict
 
 from model.service import Service
+from util.cpu import AffinityMask
+
+ProcessKey = tuple[int, Optional[float]]
+"""
+The identity of a process: its PID and creation time, which stays unique even when the PID is reused.
+"""
 
 
 class Process(BaseModel):
@@ -65,9 +71,9 @@ class Process(BaseModel):
         exclude=True
     )
 
-    affinity: Optional[list[int]] = Field(
+    affinity: Optional[AffinityMask] = Field(
         title="CPU Core Affinity",
-        description="A list of integers representing the CPU cores to which the __process__ is bound (**CPU core affinity**).",
+        description="A bitmask of the CPU cores to which the __process__ is bound (**CPU core affinity**).",
         exclude=True
     )
 
@@ -82,7 +88,18 @@ class Process(BaseModel):
         exclude=True
     )
 
-    is_new: bool = Field(exclude=True)
+    create_time: Optional[float] = Field(
+        default=None,
+        description="The creation time of the __process__ as a timestamp.",
+        exclude=True
+    )
+
+    @property
+    def key(self) -> ProcessKey:
+        """
+        Returns the identity of the process, see `ProcessKey`.
+        """
+        return self.pid, self.create_time
 
     def __hash__(self):
         return hash((self.pid, self.bin_path, self.process_name, self.cmd_line))
@@ -0,0 +1,123 @@
+import json
+from abc import ABC
+from dataclasses import asdict
+from typing import Optional
+
+from configuration.rules_diff import RuleKey
+from constants.app_info import APP_VERSION
+from constants.files import CONFIG_CACHE_FILE_NAME
+from constants.log import LOG
+from util.atomic_file import write_atomically
+from util.cpu_topology import cpu_topology
+
+
+class ConfigCacheService(ABC):
+    """
+    ConfigCacheService stores the content keys of the rules next to the configuration file, so that the next start
+    with the same file skips computing them.
+
+    The cache is a JSON file of two lines: a header with the content hash, the application version and the CPU
+    topology, and the rule keys. Only the header is read when the cache is stale. The cache holds plain strings
+    only, so it can be loaded without validation; the configuration itself is always validated from its file.
+    """
+
+    @staticmethod
+    def load(content_hash: bytes) -> Optional[list[RuleKey]]:
+        """
+        Loads the cached rule keys.
+
+        Args:
+            content_hash (bytes): The hash of the current content of the configuration file.
+
+        Returns:
+            Optional[list[RuleKey]]: The rule keys in matching order, or None if there is no cache, it was built from
+            other content, by another version of the application or for another CPU, or it cannot be read.
+        """
+        try:
+            with open(CONFIG_CACHE_FILE_NAME, 'r', encoding='utf-8') as file:
+                if json.loads(file.readline()) != _header(content_hash):
+                    return None
+
+                rule_keys = json.loads(file.readline())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            rule_keys = None
+
+        if not isinstance(rule_keys, list) or not all(isinstance(key, str) for key in rule_keys):
+            LOG.warning(f"The configuration cache `{CONFIG_CACHE_FILE_NAME}` is corrupted and will be rebuilt.")
+            return None
+
+        return rule_keys
+
+    @staticmethod
+    def save(content_hash: bytes, rule_keys: list[RuleKey]):
+        """
+        Replaces the cache with the given rule keys. Failures are logged and otherwise ignored.
+
+        Args:
+            content_hash (bytes): The hash of the content of the configuration file.
+            rule_keys (list[RuleKey]): The content keys of the rules in matching order.
+        """
+        try:
+            content = '\n'.join((
+                json.dumps(_header(content_hash), separators=(',', ':')),
+                json.dumps(rule_keys, separators=(',', ':'))
+            ))
+            write_atomically(CONFIG_CACHE_FILE_NAME, content.encode('utf-8'))
+        except Exception:
+            LOG.warning(f"Failed to write the configuration cache `{CONFIG_CACHE_FILE_NAME}`.", exc_info=True)
+
+
+def _header(content_hash: bytes) -> dict:
+    """
+    Returns the header that the cache must have to be valid for the content and the current application and CPU.
+    The topology is passed through JSON so that it compares equal to its loaded form.
+    """
+    return {
+        'appVersion': APP_VERSION,
+        'contentHash': content_hash.hex(),
+        'topology': json.loads(json.dumps(asdict(cpu_topology())))
+    }
+
+
+if __name__ == '__main__':
+    import hashlib
+    import json
+    import os
+    import tempfile
+    from time import perf_counter
+
+    from pydantic import TypeAdapter
+
+    from configuration.config import Config
+    from configuration.rules_diff import rule_key
+
+    # Compares a cold start (validating the rules and computing their keys) with a warm start, which validates
+    # the rules and takes their keys from the cache.
+    os.chdir(tempfile.mkdtemp())
+
+    content = json.dumps({
+        "processRules": [
+            {"selector": f"C:/Program Files/**/app{i}.exe", "selectorBy": "Path", "priority": "High", "affinity": "0"}
+            for i in range(5000)
+        ]
+    }).encode()
+    content_hash = hashlib.blake2b(content, digest_size=16).digest()
+    adapter = TypeAdapter(Config)
+
+    started_at = perf_counter()
+    config = adapter.validate_json(content)
+    rule_keys = [rule_key(rule) for rule in [*config.serviceRules, *config.processRules]]
+    cold = perf_counter() - started_at
+
+    ConfigCacheService.save(content_hash, rule_keys)
+
+    started_at = perf_counter()
+    adapter.validate_json(content)
+    cached = ConfigCacheService.load(content_hash)
+    warm = perf_counter() - started_at
+
+    assert cached == rule_keys
+    assert ConfigCacheService.load(b'other content') is None
+    print(f"rules: {len(rule_keys)}, cold: {cold * 1000:.1f} ms, warm: {warm * 1000:.1f} ms")
@@ -1,16 +1,27 @@
+import hashlib
 import json
 import os.path
+import re
+import tempfile
+import threading
 from abc import ABC
+from contextlib import suppress
 from datetime import datetime
 from os.path import exists
-from typing import Optional, Any
+from time import sleep
+from typing import Optional, Sequence
 
+from pydantic import TypeAdapter, ValidationError
 from pydantic.config import JsonDict
+from pydantic_core import ErrorDetails
 
 from configuration.config import Config
+from configuration.loaded_config import LoadedConfig, LoadedRulePack, RuleLocation
+from configuration.rules_diff import RuleKey, RulesDiff, rule_key
 from constants.files import CONFIG_FILE_NAME, CONFIG_FILE_ENCODING
 from enums.rules import RuleType
-from util.decorators import cached
+from service.config_cache_service import ConfigCacheService
+from util.file_watcher import FileWatcher, FileSignature, create_file_watcher, file_signature
 
 
 class ConfigService(ABC):
@@ -33,12 +44,9 @@ class ConfigService(ABC):
         if config is None:
             raise ValueError("config is None")
 
-        with open(CONFIG_FILE_NAME, 'w', encoding=CONFIG_FILE_ENCODING) as file:
-            json_data = config.model_dump_json(indent=4, exclude_none=True, warnings=False)
-            file.write(json_data)
+        cls.__write(config.model_dump_json(indent=4, exclude_none=True, warnings=False))
 
     @classmethod
-    @cached(1)
     def load_config(cls, validate=True) -> Config:
         """
         Load the configuration from a JSON file or create a new one if the file doesn't exist.
@@ -53,34 +61,210 @@ class ConfigService(ABC):
             cls.save_config(config := Config())
             return config
 
-        with open(CONFIG_FILE_NAME, 'r', encoding=CONFIG_FILE_ENCODING) as file:
-            if validate:
-                return Config(**json.load(file))
+        content = cls.__read()
+
+        if not validate:
+            return Config.model_construct(**json.loads(content.decode(CONFIG_FILE_ENCODING)))
+
+        loaded = cls.__validate(content)
+
+        if loaded.error:
+            raise loaded.error
+
+        return loaded.config
+
+    __config_adapter: TypeAdapter[Config] = TypeAdapter(Config)
+    __loaded: Optional[LoadedConfig] = None
+
+    @classmethod
+    def __validate(cls, content: bytes) -> LoadedConfig:
+        """
+        Validates the raw content of the configuration file in one pass, reusing the previous result for the same content.
+        """
+        content_hash = hashlib.blake2b(content, digest_size=16).digest()
+        loaded = cls.__loaded
+
+        if loaded is not None and loaded.content_hash == content_hash:
+            return loaded
+
+        try:
+            loaded = LoadedConfig(content_hash, config=cls.__config_adapter.validate_json(content))
+        except ValidationError as e:
+            loaded = LoadedConfig(content_hash, error=e)
+            rule_fields = {rule_type.field_in_config for rule_type in RuleType}
+
+            for error in e.errors():
+                loc = error['loc']
+
+                if len(loc) >= 2 and loc[0] in rule_fields and isinstance(loc[1], int):
+                    loaded.rule_errors.setdefault((loc[0], loc[1]), []).append(error)
 
-            return Config.model_construct(**json.load(file))
+        cls.__loaded = loaded
+        return loaded
 
-    __prev_mtime = 0
+    __watcher: Optional[FileWatcher] = None
+    __changed = threading.Event()
+    __content_hash: Optional[bytes] = None
 
     @classmethod
     def reload_if_changed(cls, prev_config: Optional[Config]) -> tuple[Config, bool]:
         """
         Reloads the configuration if it has changed since the last reload and returns the updated configuration and a flag indicating whether the configuration has changed.
 
+        Changes are detected by a file watcher, and the file is only parsed when its content hash differs from the last loaded one.
+
         Args:
             prev_config (Optional[Config]): The previous configuration object. Can be None if there is no previous configuration.
 
         Returns:
             tuple[Config, bool]: A tuple containing the updated configuration object and a boolean flag indicating whether the configuration has changed. If the configuration has changed or there is no previous configuration, the updated configuration is loaded from the file. Otherwise, the previous configuration is returned.
         """
-        current_mtime = os.path.getmtime(CONFIG_FILE_NAME)
-        is_changed = current_mtime > cls.__prev_mtime
+        if cls.__watcher is None:
+            cls.__watcher = create_file_watcher(CONFIG_FILE_NAME, cls.__changed.set)
+        elif prev_config is not None and not cls.__changed.is_set():
+            return prev_config, False
+
+        cls.__changed.clear()
+
+        if not exists(CONFIG_FILE_NAME):
+            cls.save_config(Config())
+
+        loaded = cls.__validate(cls.__read())
+
+        if prev_config is not None and loaded.content_hash == cls.__content_hash:
+            return prev_config, False
+
+        if loaded.error:
+            raise loaded.error
+
+        cls.__content_hash = loaded.content_hash
+
+        return loaded.config, True
+
+    @classmethod
+    def __read(cls) -> bytes:
+        """
+        Reads the content of the configuration file.
+
+        If the file is still the one last written by this application, its content is taken from memory.
+        """
+        written = cls.__written
+
+        if written is not None and file_signature(CONFIG_FILE_NAME) == written[0]:
+            return written[1]
+
+        with open(CONFIG_FILE_NAME, 'rb') as file:
+            return file.read()
+
+    @classmethod
+    def wait_for_change(cls, timeout: float) -> bool:
+        """
+        Blocks until the configuration file changes or the timeout expires.
+
+        Args:
+            timeout (float): The maximum time to wait in seconds.
+
+        Returns:
+            bool: True if the configuration file has changed.
+        """
+        return cls.__changed.wait(timeout)
+
+    @classmethod
+    def diff_rules(
+            cls,
+            old_config: Optional[Config],
+            new_config: Config,
+            old_packs: Sequence[LoadedRulePack] = (),
+            new_packs: Sequence[LoadedRulePack] = ()
+    ) -> RulesDiff:
+        """
+        Compares the rules of two configurations together with their rule packs by content.
+
+        Rules are matched in a fixed order: the service rules of the configuration and then of the rule packs,
+        followed by the process rules in the same order. Rule packs are ordered by file name.
+        The rules of the profiles are compared as well, but they are listed per profile.
+
+        Args:
+            old_config (Optional[Config]): The previous configuration, or None if there is none.
+            new_config (Config): The new configuration.
+            old_packs (Sequence[LoadedRulePack]): The previous rule packs.
+            new_packs (Sequence[LoadedRulePack]): The new rule packs.
+
+        Returns:
+            RulesDiff: The keys of the new rules in matching order together with the added and removed rules.
+        """
+        old_keys = set()
+
+        if old_config is not None:
+            old_keys.update(cls.__rule_keys(old_config))
+
+            for profile in old_config.profiles:
+                old_keys.update(rule_key(rule) for rule in [*profile.serviceRules, *profile.processRules])
+
+        for pack in old_packs:
+            old_keys.update(pack.rule_keys)
+
+        sources = [
+            (cls.__rule_keys(new_config), new_config.serviceRules, new_config.processRules),
+            *((pack.rule_keys, pack.pack.serviceRules, pack.pack.processRules) for pack in new_packs)
+        ]
+        service_rules = [
+            (key, rule)
+            for keys, rules, _ in sources
+            for key, rule in zip(keys, rules)
+        ]
+        process_rules = [
+            (key, rule)
+            for keys, service, rules in sources
+            for key, rule in zip(keys[len(service):], rules)
+        ]
+
+        diff = RulesDiff()
+
+        for key, rule in [*service_rules, *process_rules]:
+            diff.keys.append(key)
+
+            if key not in old_keys:
+                diff.added[key] = rule
+
+        for profile in new_config.profiles:
+            profile_rules = [(rule_key(rule), rule) for rule in [*profile.serviceRules, *profile.processRules]]
+            diff.profiles.append((profile, [key for key, _ in profile_rules]))
+
+            for key, rule in profile_rules:
+                if key not in old_keys:
+                    diff.added[key] = rule
+
+        diff.removed = old_keys.difference(diff.keys, *(keys for _, keys in diff.profiles))
+        return diff
+
+    @classmethod
+    def __rule_keys(cls, config: Config) -> list[RuleKey]:
+        """
+        Returns the content keys of the rules of the configuration in matching order.
+
+        For the last loaded configuration, the keys are computed once and stored in the configuration cache,
+        so that the next start with the same file takes them from there.
+        """
+        loaded = cls.__loaded
+        is_loaded = loaded is not None and loaded.config is config
+
+        if is_loaded and loaded.rule_keys is not None:
+            return loaded.rule_keys
 
-        cls.__prev_mtime = current_mtime
+        rules = [*config.serviceRules, *config.processRules]
 
-        if is_changed or prev_config is None:
-            return cls.load_config(), True
+        if is_loaded:
+            keys = ConfigCacheService.load(loaded.content_hash)
 
-        return prev_config, False
+            if keys is None or len(keys) != len(rules):
+                keys = [rule_key(rule) for rule in rules]
+                ConfigCacheService.save(loaded.content_hash, keys)
+
+            loaded.rule_keys = keys
+            return keys
+
+        return [rule_key(rule) for rule in rules]
 
     @classmethod
     def rules_has_error(cls) -> bool:
@@ -90,19 +274,50 @@ class ConfigService(ABC):
         Returns:
             bool: True if there are errors in the rules, otherwise False.
         """
+        return bool(cls.rule_errors())
+
+    @classmethod
+    def rule_errors(cls) -> dict[RuleLocation, list[ErrorDetails]]:
+        """
+        Returns the validation errors of the rules in the configuration file by their location.
+
+        The result is taken from the validation cache if the content of the file has not changed.
+
+        Returns:
+            dict[RuleLocation, list[ErrorDetails]]: The validation errors, or an empty dict if the file can't be read.
+        """
+        try:
+            return cls.__validate(cls.__read()).rule_errors
+        except OSError:
+            return {}
+
+    __VERSION_PATTERN = re.compile(rb'"version"\s*:\s*(\d+)')
+    __VERSION_SEARCH_SIZE = 4096
+
+    @classmethod
+    def read_config_version(cls) -> Optional[int]:
+        """
+        Reads the version of the configuration without parsing the whole file.
+
+        The version is searched for in the beginning and the end of the file, where serializers put the top-level fields.
+
+        Returns:
+            Optional[int]: The version, or None if the file does not exist or the version is not found.
+        """
         try:
-            for rule_type in RuleType:
-                rules: list[Any] = cls.load_config_raw().get(rule_type.field_in_config, [])
+            with open(CONFIG_FILE_NAME, 'rb') as file:
+                head = file.read(cls.__VERSION_SEARCH_SIZE)
+                size = file.seek(0, os.SEEK_END)
+                file.seek(max(len(head), size - cls.__VERSION_SEARCH_SIZE))
+                tail = file.read()
+        except FileNotFoundError:
+            return None
 
-                try:
-                    for rule in rules:
-                        rule_type.clazz(**rule)
-                except:
-                    return True
-        except:
-            pass  # Yes, this is indeed a pass.
+        for part in (head, tail):
+            if match := cls.__VERSION_PATTERN.search(part):
+                return int(match.group(1))
 
-        return False
+        return None
 
     @classmethod
     def load_config_raw(cls) -> JsonDict:
@@ -129,8 +344,53 @@ class ConfigService(ABC):
         if config is None:
             raise ValueError("config is None")
 
-        with open(CONFIG_FILE_NAME, 'w', encoding=CONFIG_FILE_ENCODING) as file:
-            json.dump(config, file, indent=4)
+        cls.__write(json.dumps(config, indent=4))
+
+    __written: Optional[tuple[FileSignature, bytes]] = None
+
+    @classmethod
+    def __write(cls, text: str):
+        """
+        Atomically replaces the configuration file with the text.
+
+        The text is written to a temporary file next to the configuration file, which then replaces it, so readers
+        never see a partially written file. Writing the same content as the file already has is skipped.
+        """
+        content = text.replace('\n', os.linesep).encode(CONFIG_FILE_ENCODING)
+        written = cls.__written
+
+        if written is not None and written[1] == content and file_signature(CONFIG_FILE_NAME) == written[0]:
+            return
+
+        directory = os.path.dirname(os.path.abspath(CONFIG_FILE_NAME))
+        fd, temp_file_name = tempfile.mkstemp(prefix=".config.", suffix=".tmp", dir=directory)
+
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(content)
+                file.flush()
+                os.fsync(file.fileno())
+
+            cls.__replace_with_retry(temp_file_name, CONFIG_FILE_NAME)
+        except BaseException:
+            with suppress(OSError):
+                os.remove(temp_file_name)
+            raise
+
+        cls.__written = file_signature(CONFIG_FILE_NAME), content
+
+    @staticmethod
+    def __replace_with_retry(src: str, dst: str, attempts: int = 10):
+        # On Windows, the replacement fails while another thread or program has the file open.
+        for attempt in range(attempts):
+            try:
+                os.replace(src, dst)
+                return
+            except PermissionError:
+                if attempt == attempts - 1:
+                    raise
+
+                sleep(0.05)
 
     @classmethod
     def backup_config(cls):
@@ -0,0 +1,152 @@
+from abc import ABC
+from collections import deque
+from time import monotonic
+from typing import Optional
+
+from psutil import AccessDenied, NoSuchProcess
+from psutil._pswindows import Priority
+
+from configuration.cpu_throttling import CpuThrottling
+from constants.log import LOG
+from enums.priority import PriorityStr, to_priority
+from model.process import Process, ProcessKey
+from util.cpu_topology import cpu_topology
+from util.process_times import read_cpu_times
+
+_PRIORITY_RANKS: dict[Priority, int] = {to_priority[priority]: rank for rank, priority in enumerate(PriorityStr)}
+
+
+class CpuThrottlingService(ABC):
+    """
+    The CpuThrottlingService class temporarily demotes the priority of processes that use too much CPU time.
+
+    The CPU time of all candidate processes is sampled at once on every rule application. A process whose share of
+    the total CPU time over the sliding window exceeds the threshold is demoted, and it gets its original priority back
+    when its share drops below the restore threshold.
+    """
+
+    __samples: dict[ProcessKey, deque[tuple[float, float]]] = {}
+    __demoted: dict[ProcessKey, tuple[Process, Priority, Priority, float]] = {}
+    __denied: set[ProcessKey] = set()
+
+    @classmethod
+    def update(cls, settings: Optional[CpuThrottling], processes: dict[int, Process], excluded_pids: set[int]):
+        """
+        Samples the CPU time of the processes and demotes or restores them.
+
+        Args:
+            settings (Optional[CpuThrottling]): The throttling settings, or None if throttling is disabled.
+            processes (dict[int, Process]): The current snapshot of the processes.
+            excluded_pids (set[int]): The processes that must not be demoted, such as those whose priority is set
+                by a rule. If such a process is demoted, it is forgotten without restoring its priority.
+        """
+        if settings is None:
+            if cls.__demoted:
+                cls.restore_all()
+
+            cls.__samples = {}
+            return
+
+        now = monotonic()
+        window_start = now - settings.windowSeconds
+        capacity = cpu_topology().logical_count / 100
+        demoted_priority = to_priority[settings.demotedPriority]
+        demoted_rank = _PRIORITY_RANKS[demoted_priority]
+
+        cpu_times = read_cpu_times(processes)
+        prev_samples, samples = cls.__samples, {}
+        demoted, denied = cls.__demoted, cls.__denied
+        alive: set[ProcessKey] = set()
+
+        for pid, process in processes.items():
+            key = process.key
+            alive.add(key)
+
+            if pid in excluded_pids:
+                demoted.pop(key, None)
+                continue
+
+            cpu_time = cpu_times.get(pid)
+
+            if cpu_time is None or key in denied:
+                continue
+
+            history = prev_samples.get(key) or deque()
+            history.append((now, cpu_time))
+
+            while len(history) > 2 and history[1][0] <= window_start:
+                history.popleft()
+
+            samples[key] = history
+            first_time, first_cpu_time = history[0]
+
+            if first_time > window_start:
+                continue
+
+            share = (cpu_time - first_cpu_time) / ((now - first_time) * capacity)
+
+            if key in demoted:
+                cls.__restore_if_calm(process, share, settings, now)
+            elif share > settings.cpuShareThreshold and _PRIORITY_RANKS.get(process.priority, -1) > demoted_rank:
+                cls.__demote(process, share, settings, demoted_priority, now)
+
+        cls.__samples = samples
+        cls.__denied &= alive
+        cls.__demoted = {key: value for key, value in demoted.items() if key in alive}
+
+    @classmethod
+    def restore_all(cls):
+        """
+        Restores the original priority of all demoted processes, unless it has been changed by someone else meanwhile.
+        """
+        for process, original_priority, demoted_priority, _ in cls.__demoted.values():
+            try:
+                if process.process.nice() == demoted_priority:
+                    process.process.nice(original_priority)
+            except (AccessDenied, NoSuchProcess):
+                pass
+
+        if cls.__demoted:
+            LOG.info(f"Restored the priority of {len(cls.__demoted)} demoted processes.")
+
+        cls.__demoted = {}
+
+    @classmethod
+    def __demote(cls, process: Process, share: float, settings: CpuThrottling, priority: Priority, now: float):
+        original_priority = process.priority
+
+        try:
+            process.process.nice(priority)
+        except AccessDenied:
+            cls.__denied.add(process.key)
+            return
+        except NoSuchProcess:
+            return
+
+        cls.__demoted[process.key] = (process, original_priority, priority, now)
+
+        LOG.info(
+            f"Demoted {process.process_name} ({process.pid}) to {settings.demotedPriority} priority: "
+            f"it has used {share:.0f}% of CPU time over the last {settings.windowSeconds:g} seconds."
+        )
+
+    @classmethod
+    def __restore_if_calm(cls, process: Process, share: float, settings: CpuThrottling, now: float):
+        _, original_priority, demoted_priority, demoted_at = cls.__demoted[process.key]
+
+        if process.priority != demoted_priority:
+            # The priority has been changed by someone else, so it is no longer ours to restore.
+            del cls.__demoted[process.key]
+            return
+
+        if share >= settings.restoreShareThreshold or now - demoted_at < settings.minDemotionSeconds:
+            return
+
+        del cls.__demoted[process.key]
+
+        try:
+            process.process.nice(original_priority)
+        except (AccessDenied, NoSuchProcess):
+            return
+
+        LOG.info(f"Restored the priority of {process.process_name} ({process.pid}): its CPU usage has dropped.")
@@ -0,0 +1,153 @@
+import atexit
+import heapq
+import threading
+from abc import ABC
+from itertools import count
+from time import monotonic
+from typing import Optional
+
+from psutil import AccessDenied, NoSuchProcess
+
+from constants.log import LOG
+from model.process import Process, ProcessKey
+
+
+class DutyCycleService(ABC):
+    """
+    The DutyCycleService class caps the CPU usage of processes by suspending and resuming them periodically.
+
+    A single background thread drives all throttled processes from a timer heap. Every suspended process is resumed
+    when it stops being throttled and when the application exits, including an exit without `stop`.
+    """
+
+    __PERIOD_SECONDS = 0.1
+
+    __condition = threading.Condition()
+    __targets: dict[ProcessKey, tuple[Process, float]] = {}
+    __schedule: list[tuple[float, int, ProcessKey, int, bool]] = []
+    __sequence = count()
+    __chains: dict[ProcessKey, int] = {}
+    __suspended: dict[ProcessKey, Process] = {}
+    __denied: set[ProcessKey] = set()
+    __thread: Optional[threading.Thread] = None
+    __stopped = False
+
+    @classmethod
+    def update(cls, targets: dict[ProcessKey, tuple[Process, float]]):
+        """
+        Sets the processes to throttle.
+
+        Args:
+            targets (dict[ProcessKey, tuple[Process, float]]): The processes and the share of time, in percent,
+                they are allowed to run. Processes missing from it are resumed and no longer throttled.
+        """
+        with cls.__condition:
+            if cls.__stopped:
+                return
+
+            now = monotonic()
+            cls.__denied &= targets.keys()
+
+            for key in cls.__targets.keys() - targets.keys():
+                cls.__chains.pop(key, None)
+                cls.__resume(key)
+
+            for key, (process, duty_cycle) in targets.items():
+                if key not in cls.__targets and key not in cls.__denied:
+                    # Every throttled process has a single chain of events, older events of a process are skipped.
+                    cls.__chains[key] = chain = next(cls.__sequence)
+                    running_seconds = cls.__PERIOD_SECONDS * duty_cycle / 100
+                    heapq.heappush(cls.__schedule, (now + running_seconds, chain, key, chain, True))
+                    LOG.info(f"Throttling {process.process_name} ({process.pid}) to {duty_cycle:g}% of the time.")
+
+            cls.__targets = {key: target for key, target in targets.items() if key not in cls.__denied}
+
+            if cls.__targets and cls.__thread is None:
+                cls.__thread = threading.Thread(target=cls.__run, name="duty-cycle", daemon=True)
+                cls.__thread.start()
+                atexit.register(cls.stop)
+
+            cls.__condition.notify()
+
+    @classmethod
+    def stop(cls):
+        """
+        Stops throttling and resumes all suspended processes.
+        """
+        with cls.__condition:
+            cls.__stopped = True
+            cls.__targets = {}
+            cls.__schedule = []
+            cls.__chains = {}
+
+            for key in list(cls.__suspended):
+                cls.__resume(key)
+
+            cls.__condition.notify()
+
+    @classmethod
+    def __run(cls):
+        try:
+            with cls.__condition:
+                while not cls.__stopped:
+                    schedule = cls.__schedule
+
+                    if not schedule:
+                        cls.__condition.wait()
+                        continue
+
+                    timeout = schedule[0][0] - monotonic()
+
+                    if timeout > 0:
+                        cls.__condition.wait(timeout)
+                        continue
+
+                    due_time, _, key, chain, is_suspend = heapq.heappop(schedule)
+
+                    if cls.__chains.get(key) == chain:
+                        cls.__switch(key, chain, is_suspend, max(due_time, monotonic() - cls.__PERIOD_SECONDS))
+        except BaseException:
+            LOG.exception("Duty cycling failed, all throttled processes are resumed.")
+            cls.stop()
+        finally:
+            with cls.__condition:
+                for key in list(cls.__suspended):
+                    cls.__resume(key)
+
+    @classmethod
+    def __switch(cls, key: ProcessKey, chain: int, is_suspend: bool, due_time: float):
+        process, duty_cycle = cls.__targets[key]
+
+        try:
+            if is_suspend:
+                process.process.suspend()
+                cls.__suspended[key] = process
+                next_seconds = cls.__PERIOD_SECONDS * (100 - duty_cycle) / 100
+            else:
+                cls.__resume(key)
+                next_seconds = cls.__PERIOD_SECONDS * duty_cycle / 100
+        except (AccessDenied, NoSuchProcess) as e:
+            del cls.__targets[key]
+            del cls.__chains[key]
+
+            if isinstance(e, AccessDenied):
+                cls.__denied.add(key)
+                LOG.warning(f"Failed to throttle {process.process_name} ({process.pid}).")
+
+            return
+
+        heapq.heappush(cls.__schedule, (due_time + next_seconds, next(cls.__sequence), key, chain, not is_suspend))
+
+    @classmethod
+    def __resume(cls, key: ProcessKey):
+        process = cls.__suspended.pop(key, None)
+
+        if process is None:
+            return
+
+        try:
+            process.process.resume()
+        except NoSuchProcess:
+            pass
+        except AccessDenied:
+            LOG.error(f"Failed to resume {process.process_name} ({process.pid}).")
@@ -7,6 +7,7 @@ from psutil import NoSuchProcess
 
 from model.process import Process
 from service.services_info_service import ServicesInfoService
+from util.cpu import cores_to_mask
 from util.utils import none_int
 
 
@@ -34,18 +35,17 @@ class ProcessesInfoService(ABC):
             try:
                 process_info = psutil.Process(pid)
                 info = process_info.as_dict(attrs=[
-                    'exe',
+                    'create_time',
                     'nice', 'ionice', 'cpu_affinity'
                 ])
 
                 if pid in cache:
                     process = cache[pid]
 
-                    if process.bin_path == info['exe']:
+                    if process.create_time == info['create_time']:
                         process.priority = none_int(info['nice'])
                         process.io_priority = none_int(info['ionice'])
-                        process.affinity = info['cpu_affinity']
-                        process.is_new = False
+                        process.affinity = cores_to_mask(info['cpu_affinity'])
                         continue
 
                 if services is None:
@@ -53,7 +53,7 @@ class ProcessesInfoService(ABC):
 
                 service = services.get(pid)
                 info = process_info.as_dict(attrs=[
-                    'name', 'exe', 'cmdline',
+                    'name', 'exe', 'cmdline', 'create_time',
                     'nice', 'ionice', 'cpu_affinity'
                 ])
 
@@ -65,10 +65,10 @@ class ProcessesInfoService(ABC):
                     cmd_line=cls._get_command_line(pid, info),
                     priority=none_int(info['nice']),
                     io_priority=none_int(info['ionice']),
-                    affinity=info['cpu_affinity'],
+                    affinity=cores_to_mask(info['cpu_affinity']),
+                    create_time=info['create_time'],
                     process=process_info,
-                    service=service,
-                    is_new=True
+                    service=service
                 )
             except NoSuchProcess:
                 pass
@@ -80,6 +80,23 @@ class ProcessesInfoService(ABC):
 
         return cache.copy()
 
+    @staticmethod
+    def refresh_process(process: Process):
+        """
+        Re-reads the priority, I/O priority and affinity of a single process without taking a new snapshot.
+
+        Args:
+            process (Process): The process to refresh.
+
+        Raises:
+            NoSuchProcess: If the process no longer exists.
+        """
+        info = process.process.as_dict(attrs=['nice', 'ionice', 'cpu_affinity'])
+
+        process.priority = none_int(info['nice'])
+        process.io_priority = none_int(info['ionice'])
+        process.affinity = cores_to_mask(info['cpu_affinity'])
+
     @staticmethod
     def _get_command_line(pid, info):
         if pid == 0:
@@ -0,0 +1,113 @@
+import hashlib
+import os
+from abc import ABC
+from glob import glob
+from typing import Optional
+
+from pydantic import TypeAdapter, ValidationError
+
+from configuration.loaded_config import LoadedRulePack
+from configuration.rule_pack import RulePack
+from configuration.rules_diff import rule_key
+from constants.files import CONFIG_FILE_NAME
+from constants.log import LOG
+from util.file_watcher import FileSignature, file_signature
+
+
+class RulePacksService(ABC):
+    """
+    RulePacksService loads the rule pack files included by the configuration.
+
+    Each file is tracked separately, so only the files that have changed since the previous reload are read and validated.
+    """
+
+    __pack_adapter: TypeAdapter[RulePack] = TypeAdapter(RulePack)
+    __packs: dict[str, LoadedRulePack] = {}
+    __invalid: dict[str, Optional[FileSignature]] = {}
+    __generation = 0
+
+    @classmethod
+    def reload_if_changed(cls, directory: Optional[str]) -> tuple[list[LoadedRulePack], bool]:
+        """
+        Reloads the rule packs whose files have changed since the previous reload.
+
+        An invalid file is reported once and its previously loaded content, if any, stays in effect until the file is fixed.
+
+        Args:
+            directory (Optional[str]): The rule packs directory relative to the configuration file, or None if rule packs
+                are not used.
+
+        Returns:
+            tuple[list[LoadedRulePack], bool]: The rule packs ordered by file name and a flag indicating whether any of
+            them has been added, changed or removed.
+        """
+        paths = cls.__pack_paths(directory)
+        generation = cls.__generation + 1
+        packs: dict[str, LoadedRulePack] = {}
+        is_changed = not cls.__packs.keys() <= set(paths)
+
+        for path in paths:
+            prev_pack = cls.__packs.get(path)
+            pack = cls.__reload_pack(path, prev_pack, generation)
+
+            if pack is not None:
+                packs[path] = pack
+                is_changed = is_changed or pack is not prev_pack
+
+        cls.__invalid = {path: signature for path, signature in cls.__invalid.items() if path in paths}
+        cls.__packs = packs
+
+        if is_changed:
+            cls.__generation = generation
+
+        return list(packs.values()), is_changed
+
+    @staticmethod
+    def __pack_paths(directory: Optional[str]) -> list[str]:
+        if not directory:
+            return []
+
+        config_directory = os.path.dirname(os.path.abspath(CONFIG_FILE_NAME))
+        pattern = os.path.join(config_directory, directory, "*.json")
+
+        return sorted(glob(pattern), key=lambda path: os.path.basename(path).lower())
+
+    @classmethod
+    def __reload_pack(
+            cls,
+            path: str,
+            prev_pack: Optional[LoadedRulePack],
+            generation: int
+    ) -> Optional[LoadedRulePack]:
+        signature = file_signature(path)
+
+        if prev_pack is not None and prev_pack.signature == signature:
+            return prev_pack
+
+        if path in cls.__invalid and cls.__invalid[path] == signature:
+            return prev_pack
+
+        try:
+            with open(path, 'rb') as file:
+                content = file.read()
+        except OSError:
+            LOG.exception(f"Failed to read the rule pack `{path}`.")
+            return prev_pack
+
+        content_hash = hashlib.blake2b(content, digest_size=16).digest()
+
+        if prev_pack is not None and prev_pack.content_hash == content_hash:
+            prev_pack.signature = signature
+            return prev_pack
+
+        try:
+            pack = cls.__pack_adapter.validate_json(content)
+        except ValidationError as e:
+            cls.__invalid[path] = signature
+            LOG.error(f"The rule pack `{path}` is invalid, its previously loaded rules stay in effect until it is fixed.\n{e}")
+            return prev_pack
+
+        cls.__invalid.pop(path, None)
+        rule_keys = [rule_key(rule) for rule in [*pack.serviceRules, *pack.processRules]]
+
+        return LoadedRulePack(path, signature, content_hash, pack, rule_keys, generation)
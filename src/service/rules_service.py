@@ -1,23 +1,41 @@
+import heapq
+import json
 import os
 from abc import ABC
-from typing import Optional, Callable
+from itertools import count
+from time import monotonic, perf_counter
+from typing import Optional, Callable, Any, Sequence
 
-import psutil
 from psutil import AccessDenied, NoSuchProcess
+from psutil._pswindows import Priority, IOPriority
 
-from configuration.config import Config
+from configuration.cpu_throttling import CpuThrottling
+from configuration.profile import Profile
 from configuration.rule import ProcessRule, ServiceRule
-from constants.log import LOG
+from configuration.rules_diff import RulesDiff, RuleKey
+from configuration.thread_rule import ThreadRule
+from constants.files import STATE_FILE_NAME
+from constants.log import LOG, RULE_EVENTS_LOG
 from enums.bool import BoolStr
 from enums.io_priority import to_iopriority
 from enums.priority import to_priority
 from enums.process import ProcessParameter
 from enums.selector import SelectorType
-from model.process import Process
+from model.compiled_rule import CompiledRule
+from model.process import Process, ProcessKey
+from service.cpu_throttling_service import CpuThrottlingService
+from service.duty_cycle_service import DutyCycleService
 from service.processes_info_service import ProcessesInfoService
-from util.cpu import format_affinity
-from util.decorators import cached
+from service.thread_rules_service import ThreadRulesService
+from util.aggregated_log import LazyStr
+from util.atomic_file import write_atomically
+from util.backoff import OscillationBackoff, OscillationState
+from util.bounded_cache import BoundedCache
+from util.cpu import format_affinity_mask, mask_to_cores
+from util.cpu_topology import AffinityMask
+from util.job_object import JobObject
 from util.scheduler import TaskScheduler
+from util.system_load import LoadCondition, sample_system_load
 from util.utils import path_match
 
 
@@ -27,73 +45,838 @@ class RulesService(ABC):
     """
 
     __ignore_pids: set[int] = {0, os.getpid()}
-    __ignored_process_parameters: dict[Process, set[ProcessParameter]] = {}
+    __ignored_process_parameters: BoundedCache[ProcessKey, set[ProcessParameter]] = BoundedCache(16384)
+
+    __compiled_rules: dict[RuleKey, CompiledRule] = {}
+    __ordered_rules: list[CompiledRule] = []
+    __matching_rules: list[CompiledRule] = []
+    __base_keys: list[RuleKey] = []
+    __profiles: list[tuple[Profile, CompiledRule, list[RuleKey]]] = []
+    __active_profiles: tuple[str, ...] = ()
+    __matched_rules: BoundedCache[ProcessKey, RuleKey] = BoundedCache(65536)
+    __originals: BoundedCache[ProcessKey, dict[ProcessParameter, tuple[Any, Any]]] = BoundedCache(65536)
+
+    __force_schedule: list[tuple[float, int, CompiledRule]] = []
+    __force_schedule_sequence = count()
+    __force_targets: dict[RuleKey, list[Process]] = {}
+
+    __backoff: OscillationBackoff = OscillationBackoff()
+    __FIGHTING_SUMMARY_SECONDS = 300
+    __next_fighting_summary = 0.0
+
+    __jobs: dict[RuleKey, Optional[JobObject]] = {}
+    __job_members: BoundedCache[ProcessKey, RuleKey] = BoundedCache(65536)
+    __job_denied: BoundedCache[ProcessKey, RuleKey] = BoundedCache(16384)
+
+    __reserved_cores: AffinityMask = 0
+    __isolated_processes: BoundedCache[ProcessKey, tuple[AffinityMask, AffinityMask]] = BoundedCache(65536)
+
+    __CONDITION_HOLD_SECONDS = 10
+    __condition_states: dict[LoadCondition, tuple[bool, Optional[float]]] = {}
+
+    __STATE_VERSION = 1
+    __restored_rules: dict[ProcessKey, RuleKey] = {}
 
     @classmethod
-    def apply_rules(cls, config: Config, only_new: bool):
+    def apply_rules(
+            cls,
+            diff: Optional[RulesDiff],
+            throttling: Optional[CpuThrottling] = None,
+            thread_rules: Sequence[ThreadRule] = ()
+    ):
         """
         Apply the rules defined in the configuration to handle processes and services.
 
         Args:
-            config (Config): The configuration object containing the rules.
-            only_new (bool, optional): If set to True, all processes will be fetched, regardless of their status.
+            diff (Optional[RulesDiff]): The difference to the previously applied rules if the configuration has changed,
+                otherwise None. Only added and changed rules are compiled, and only processes whose matching rule
+                has changed are reapplied.
+            throttling (Optional[CpuThrottling]): The settings of the temporary demotion of CPU hogs, or None if it is
+                disabled. Processes whose priority is set by a rule are never demoted.
+            thread_rules (Sequence[ThreadRule]): The rules for individual threads of processes.
 
         Returns:
             None
         """
-        if not (config.serviceRules or config.processRules):
+        if diff is not None:
+            cls.__update_rules(diff)
+
+        if (not cls.__ordered_rules and not cls.__profiles and not len(cls.__isolated_processes)
+                and not len(cls.__originals) and throttling is None and not thread_rules):
+            CpuThrottlingService.update(None, {}, set())
+            DutyCycleService.update({})
+            return
+
+        processes = ProcessesInfoService.get_processes()
+
+        alive = {process.key for process in processes.values()}
+
+        cls.__ignored_process_parameters.retain(alive)
+        cls.__matched_rules.retain(alive)
+        cls.__originals.retain(alive)
+        cls.__isolated_processes.retain(alive)
+        cls.__job_members.retain(alive)
+        cls.__job_denied.retain(alive)
+        cls.__backoff.retain(lambda key: key[0] in alive)
+        switch_started_at = cls.__switch_profiles(processes)
+        cls.__evaluate_conditions()
+        matched_rules = cls.__handle_processes(processes)
+
+        if switch_started_at is not None:
+            switch_ms = (perf_counter() - switch_started_at) * 1000
+            LOG.info(f"Processes reconciled with the profile rules in {switch_ms:.1f} ms.")
+
+        cls.__isolate_cores(processes, matched_rules)
+        DutyCycleService.update({
+            processes[pid].key: (processes[pid], rule.dutyCycle)
+            for pid, rule in matched_rules.items()
+            if rule.dutyCycle
+        })
+        CpuThrottlingService.update(
+            throttling,
+            processes,
+            cls.__ignore_pids | {pid for pid, rule in matched_rules.items() if rule.priority}
+        )
+        ThreadRulesService.apply(thread_rules, processes)
+        cls.__restored_rules = {}
+        cls.__log_fighting_processes()
+        RULE_EVENTS_LOG.flush()
+
+    @classmethod
+    def save_state(cls):
+        """
+        Saves the rules matched to the running processes, their ignored parameters and their original settings
+        to the state file, so that the next start can skip processes that are already in the desired state and
+        still restore their settings when their rule no longer applies.
+        """
+        rule_indexes: dict[RuleKey, int] = {}
+        processes = []
+
+        for (pid, create_time), matched_key in cls.__matched_rules.items():
+            if not matched_key:
+                continue
+
+            rule_index = rule_indexes.setdefault(matched_key, len(rule_indexes))
+            ignored = cls.__ignored_process_parameters.get((pid, create_time)) or set()
+            processes.append([pid, create_time, rule_index, sorted(param.value for param in ignored)])
+
+        originals = []
+
+        for (pid, create_time), values in cls.__originals.items():
+            # Settings whose original value is unknown are never restored, so they are not saved.
+            values = [
+                [param.value, int(original), int(applied)]
+                for param, (original, applied) in values.items()
+                if original is not None
+            ]
+
+            if values:
+                originals.append([pid, create_time, values])
+
+        state = {
+            'version': cls.__STATE_VERSION,
+            'rules': list(rule_indexes),
+            'processes': processes,
+            'originals': originals
+        }
+
+        try:
+            write_atomically(STATE_FILE_NAME, json.dumps(state, separators=(',', ':')).encode('utf-8'))
+        except OSError:
+            LOG.exception(f"Failed to save the state to `{STATE_FILE_NAME}`.")
+
+    @classmethod
+    def load_state(cls):
+        """
+        Loads the state saved by `save_state`.
+
+        A restored process is not handled again on the first rule application if it still matches the same rule
+        and is already in the state that the rule describes. Its ignored parameters are not retried, and its original
+        settings are restored once its rule no longer applies.
+        """
+        try:
+            with open(STATE_FILE_NAME, 'r', encoding='utf-8') as file:
+                state = json.load(file)
+
+            if state.get('version') != cls.__STATE_VERSION:
+                return
+
+            rules: list[RuleKey] = state['rules']
+
+            for pid, create_time, rule_index, ignored in state['processes']:
+                key = (pid, create_time)
+                cls.__restored_rules[key] = rules[rule_index]
+
+                if ignored:
+                    cls.__ignored_process_parameters.put(key, {ProcessParameter(value) for value in ignored})
+
+            for pid, create_time, values in state.get('originals', ()):
+                cls.__originals.put((pid, create_time), {
+                    (param := ProcessParameter(value)): (cls.__to_value(param, original), cls.__to_value(param, applied))
+                    for value, original, applied in values
+                })
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError, IndexError):
+            LOG.warning(f"The state file `{STATE_FILE_NAME}` is corrupted and will be ignored.")
+            cls.__restored_rules = {}
+            cls.__originals = BoundedCache(65536)
+
+    @staticmethod
+    def __to_value(param: ProcessParameter, value: int) -> Any:
+        if param == ProcessParameter.NICE:
+            return Priority(value)
+        elif param == ProcessParameter.IONICE:
+            return IOPriority(value)
+
+        return value
+
+    @classmethod
+    def release_jobs(cls):
+        """
+        Lifts the CPU limits and weights of all rules from their processes.
+        """
+        for job in cls.__jobs.values():
+            if job is not None:
+                job.release()
+
+        cls.__jobs = {}
+        cls.__job_members = BoundedCache(65536)
+        cls.__job_denied = BoundedCache(16384)
+
+    @classmethod
+    def __log_fighting_processes(cls):
+        """
+        Periodically logs the process parameters that the processes keep resetting after they have been applied,
+        together with their number of reverts and the current backoff.
+        """
+        now = monotonic()
+
+        if now < cls.__next_fighting_summary:
+            return
+
+        cls.__next_fighting_summary = now + cls.__FIGHTING_SUMMARY_SECONDS
+        fighting: dict[tuple[ProcessKey, ProcessParameter], OscillationState] = cls.__backoff.fighting()
+
+        if not fighting:
+            return
+
+        summary = '; '.join(
+            f"{state.label} ({pid}) {param.value}: reverted {state.reverts} times, "
+            f"retried every {state.backoff_seconds:g} seconds"
+            for ((pid, _), param), state in fighting.items()
+        )
+        LOG.warning(f"Processes fighting forced rules: {summary}.")
+
+    @classmethod
+    def enforce_due_rules(cls):
+        """
+        Re-checks forced rules with their own interval whose time has come.
+
+        Only the processes matched by such a rule during the last rule application are refreshed and re-checked,
+        so no new snapshot of all processes is taken.
+        """
+        schedule = cls.__force_schedule
+        now = monotonic()
+
+        while schedule and schedule[0][0] <= now:
+            _, _, compiled = heapq.heappop(schedule)
+
+            for process in cls.__force_targets.get(compiled.key, []):
+                if TaskScheduler.check_task(process):
+                    continue
+
+                try:
+                    ProcessesInfoService.refresh_process(process)
+                except NoSuchProcess:
+                    continue
+
+                cls.__handle_process(process, compiled.rule)
+
+            heapq.heappush(
+                schedule,
+                (now + compiled.rule.forceInterval, next(cls.__force_schedule_sequence), compiled)
+            )
+
+        RULE_EVENTS_LOG.flush()
+
+    @classmethod
+    def next_enforcement_time(cls) -> Optional[float]:
+        """
+        Returns the `time.monotonic` time of the next re-check of a forced rule with its own interval.
+
+        Returns:
+            Optional[float]: The time of the next re-check, or None if no rule has its own interval.
+        """
+        schedule = cls.__force_schedule
+        return schedule[0][0] if schedule else None
+
+    @classmethod
+    def __update_rules(cls, diff: RulesDiff):
+        compiled_rules = cls.__compiled_rules
+
+        for key in diff.removed:
+            compiled_rules.pop(key, None)
+            cls.__release_job(key)
+
+        for key, rule in diff.added.items():
+            compiled_rules[key] = CompiledRule.compile(key, rule)
+
+        cls.__base_keys = diff.keys
+        cls.__profiles = [
+            (profile, cls.__compile_trigger(profile), keys)
+            for profile, keys in diff.profiles
+        ]
+        cls.__order_rules()
+
+    @classmethod
+    def __order_rules(cls):
+        """
+        Orders the compiled rules for matching: the rules of the active profiles in the order of the configuration
+        come first, followed by the other rules.
+        """
+        keys = [
+            *(key for profile, _, profile_keys in cls.__profiles
+              if profile.name in cls.__active_profiles
+              for key in profile_keys),
+            *cls.__base_keys
+        ]
+
+        cls.__ordered_rules = [cls.__compiled_rules[key] for key in dict.fromkeys(keys)]
+        cls.__matching_rules = cls.__ordered_rules
+        cls.__reset_force_schedule()
+
+    @classmethod
+    def __evaluate_conditions(cls):
+        """
+        Selects the rules whose conditions on the system load hold.
+
+        The system load is sampled once, and every distinct condition is evaluated once, however many rules use it.
+        Rules whose conditions do not hold are left out of matching. A condition changes its state only after
+        the load has stayed on the other side of the threshold for `__CONDITION_HOLD_SECONDS`, so a load hovering
+        around the threshold does not switch the rules on every application.
+        """
+        ordered_rules = cls.__ordered_rules
+
+        if not any(compiled.conditions for compiled in ordered_rules):
+            cls.__matching_rules = ordered_rules
+            cls.__condition_states = {}
             return
 
-        cls.__light_gc_ignored_process_parameters()
-        cls.__handle_processes(
-            config,
-            ProcessesInfoService.get_processes(),
-            only_new
+        load = sample_system_load()
+        now = monotonic()
+        prev_states, states = cls.__condition_states, {}
+
+        def holds(condition: LoadCondition) -> bool:
+            if condition not in states:
+                is_met = load.matches(condition)
+                state, changed_at = prev_states.get(condition, (is_met, None))
+
+                if is_met == state:
+                    changed_at = None
+                elif changed_at is None:
+                    changed_at = now
+                elif now - changed_at >= cls.__CONDITION_HOLD_SECONDS:
+                    state, changed_at = is_met, None
+
+                states[condition] = (state, changed_at)
+
+            return states[condition][0]
+
+        # Every condition is evaluated, so that the state of each one is kept up to date.
+        matching_rules = [compiled for compiled in ordered_rules if all([holds(c) for c in compiled.conditions])]
+        cls.__condition_states = states
+
+        # Conditions seen for the first time, e.g. after a configuration change, have not flipped.
+        if any(condition in prev_states and prev_states[condition][0] != state for condition, (state, _) in states.items()):
+            LOG.info(
+                f"System load changed (CPU {load.cpu:.0f}%, memory {load.memory:.0f}%), "
+                f"rules in effect: {len(matching_rules)} of {len(ordered_rules)}."
+            )
+
+        cls.__matching_rules = matching_rules
+
+    @staticmethod
+    def __compile_trigger(profile: Profile) -> CompiledRule:
+        return CompiledRule.compile('', ProcessRule(selectorBy=profile.triggerBy, selector=profile.trigger))
+
+    @classmethod
+    def __switch_profiles(cls, processes: dict[int, Process]) -> Optional[float]:
+        """
+        Activates the profiles whose trigger processes are running and deactivates the others.
+
+        Only the order of the precompiled rules changes, so only the processes whose matching rule changes
+        are handled again.
+
+        Returns:
+            Optional[float]: The `time.perf_counter` time of the switch, or None if no profile has been switched.
+        """
+        if not cls.__profiles and not cls.__active_profiles:
+            return None
+
+        running = [process for pid, process in processes.items() if pid not in cls.__ignore_pids]
+        active_profiles = tuple(
+            profile.name
+            for profile, trigger, _ in cls.__profiles
+            if any(trigger.matches(process) for process in running)
         )
 
+        if active_profiles == cls.__active_profiles:
+            return None
+
+        started_at = perf_counter()
+        activated = [name for name in active_profiles if name not in cls.__active_profiles]
+        deactivated = [name for name in cls.__active_profiles if name not in active_profiles]
+
+        cls.__active_profiles = active_profiles
+        cls.__order_rules()
+
+        LOG.info(
+            f"Profiles activated: {', '.join(activated) or 'none'}, "
+            f"deactivated: {', '.join(deactivated) or 'none'}."
+        )
+        return started_at
+
+    @classmethod
+    def __reset_force_schedule(cls):
+        now = monotonic()
+        cls.__force_targets = {}
+        cls.__force_schedule = schedule = [
+            (now + compiled.rule.forceInterval, next(cls.__force_schedule_sequence), compiled)
+            for compiled in cls.__ordered_rules
+            if cls.__has_own_force_interval(compiled.rule)
+        ]
+
+        heapq.heapify(schedule)
+
+    @staticmethod
+    def __has_own_force_interval(rule: ProcessRule | ServiceRule) -> bool:
+        return rule.force == BoolStr.YES and bool(rule.forceInterval)
+
     @classmethod
-    def __handle_processes(cls, config: Config, processes: dict[int, Process], only_new: bool):
+    def __handle_processes(cls, processes: dict[int, Process]) -> dict[int, ProcessRule | ServiceRule]:
+        """
+        Applies the matching rules to the processes and updates the cores reserved by isolating rules.
+
+        Returns:
+            dict[int, ProcessRule | ServiceRule]: The rules matched to the processes by pid.
+        """
+        force_targets: dict[RuleKey, list[Process]] = {}
+        matches: list[tuple[Process, CompiledRule, bool]] = []
+        unmatched: list[tuple[Process, Optional[ProcessRule | ServiceRule]]] = []
+        left_jobs: set[RuleKey] = set()
+        reserved_cores: AffinityMask = 0
+
         for pid, process in processes.items():
             if pid in cls.__ignore_pids:
                 continue
 
-            rule: Optional[ProcessRule | ServiceRule] = cls.__first_rule_by_process(config, process)
+            compiled = cls.__first_rule_by_process(process)
+            matched_key = compiled.key if compiled else ''
+            previous_key = cls.__matched_rules.get(process.key)
+
+            if previous_key is None and cls.__restored_rules:
+                previous_key = cls.__restore_matched_rule(process, compiled)
+
+                if previous_key is not None:
+                    cls.__matched_rules.put(process.key, previous_key)
+                elif cls.__restored_rules.get(process.key) not in (None, matched_key):
+                    # The rule applied before the restart no longer applies, so its settings are restored.
+                    unmatched.append((process, compiled.rule if compiled else None))
+
+            if previous_key != matched_key:
+                cls.__matched_rules.put(process.key, matched_key)
 
-            if not rule:
+                if previous_key:
+                    unmatched.append((process, compiled.rule if compiled else None))
+
+                job_key = cls.__job_members.get(process.key)
+
+                if job_key and job_key != matched_key:
+                    left_jobs.add(job_key)
+
+            if not compiled:
                 continue
 
-            if rule.force == BoolStr.NO and only_new and not process.is_new:
+            if compiled.rule.isolate == BoolStr.YES and compiled.rule.affinity:
+                reserved_cores |= compiled.rule.affinity
+
+            matches.append((process, compiled, previous_key != matched_key))
+
+        is_reservation_changed = reserved_cores != cls.__reserved_cores
+        cls.__reserved_cores = reserved_cores
+
+        if is_reservation_changed:
+            LOG.info(f"Reserved cores: {format_affinity_mask(reserved_cores) or 'none'}.")
+
+        if unmatched:
+            cls.__restore_originals(unmatched)
+
+        for key in left_jobs:
+            cls.__release_job(key)
+
+        matched_rules: dict[int, ProcessRule | ServiceRule] = {}
+        job_moves: dict[RuleKey, list[Process]] = {}
+
+        for process, compiled, is_changed in matches:
+            rule = compiled.rule
+            matched_rules[process.pid] = rule
+
+            if rule.affinity:
+                # The affinity of other rules excludes the reserved cores, so it is reapplied when they change.
+                if is_reservation_changed and rule.isolate == BoolStr.NO:
+                    is_changed = True
+
+            if cls.__needs_job(process, compiled, is_changed):
+                job_moves.setdefault(compiled.key, []).append(process)
+
+            if cls.__has_own_force_interval(rule):
+                force_targets.setdefault(compiled.key, []).append(process)
+
+                if not is_changed:
+                    continue
+            elif rule.force == BoolStr.NO and not is_changed:
                 continue
 
             if rule.delay > 0:
                 TaskScheduler.schedule_task(process, cls.__handle_process, process, rule, delay=rule.delay)
+                continue
+
+            cls.__handle_process(process, rule)
+
+        cls.__force_targets = force_targets
+
+        if job_moves:
+            cls.__assign_to_jobs(job_moves)
+
+        return matched_rules
+
+    @classmethod
+    def __isolate_cores(cls, processes: dict[int, Process], matched_rules: dict[int, ProcessRule | ServiceRule]):
+        """
+        Moves the processes without an affinity rule off the reserved cores in a single pass over the snapshot,
+        and gives the released cores back to the processes moved earlier.
+
+        The affinity of a moved process is restored only if it has not been changed by anyone else since.
+        """
+        reserved = cls.__reserved_cores
+        isolated = cls.__isolated_processes
+
+        if not reserved and not len(isolated):
+            return
+
+        moved = restored = 0
+
+        for pid, process in processes.items():
+            if pid in cls.__ignore_pids or process.affinity is None:
+                continue
+
+            if pid in matched_rules and matched_rules[pid].affinity:
+                isolated.pop(process.key)
+                continue
+
+            original, applied = isolated.get(process.key) or (process.affinity, None)
+
+            if applied is not None and process.affinity != applied:
+                original, applied = process.affinity, None
+                isolated.pop(process.key)
+
+            if applied is None and not original & reserved:
+                continue
+
+            target = original & ~reserved or original
+
+            if target == process.affinity:
+                continue
+
+            ignored_parameters = cls.__ignored_process_parameters.get_or_create(process.key, set)
+
+            if ProcessParameter.AFFINITY in ignored_parameters:
+                continue
+
+            try:
+                process.process.cpu_affinity(list(mask_to_cores(target)))
+            except AccessDenied:
+                ignored_parameters.add(ProcessParameter.AFFINITY)
+                continue
+            except NoSuchProcess:
+                continue
+
+            if target == original:
+                isolated.pop(process.key)
+                restored += 1
             else:
-                cls.__handle_process(process, rule)
+                isolated.put(process.key, (original, target))
+                moved += 1
+
+        if moved:
+            LOG.info(f"Moved {moved} processes off the reserved cores {format_affinity_mask(reserved)}.")
+
+        if restored:
+            LOG.info(f"Restored the affinity of {restored} processes after the cores have been released.")
+
+    @classmethod
+    def __restore_originals(cls, unmatched: list[tuple[Process, Optional[ProcessRule | ServiceRule]]]):
+        """
+        Restores the original settings of the processes whose rule no longer applies.
+
+        Only the parameters that the new rule of a process does not set are restored, and only if they still have
+        the values that the previous rule has set.
+        """
+        restored = 0
+
+        for process, rule in unmatched:
+            originals = cls.__originals.get(process.key)
+
+            if not originals:
+                continue
+
+            controlled = {
+                ProcessParameter.AFFINITY: bool(rule and rule.affinity),
+                ProcessParameter.NICE: bool(rule and rule.priority),
+                ProcessParameter.IONICE: bool(rule and rule.ioPriority)
+            }
+            is_restored = False
+
+            for param, (original, applied) in list(originals.items()):
+                if controlled.get(param):
+                    continue
+
+                del originals[param]
+
+                if original is None or cls.__parameter_value(process, param) != applied:
+                    continue
+
+                try:
+                    if param == ProcessParameter.AFFINITY:
+                        process.process.cpu_affinity(list(mask_to_cores(original)))
+                    elif param == ProcessParameter.NICE:
+                        process.process.nice(original)
+                    elif param == ProcessParameter.IONICE:
+                        process.process.ionice(original)
+
+                    is_restored = True
+                except AccessDenied:
+                    RULE_EVENTS_LOG.warning(
+                        (process.bin_path or process.process_name, param, 'restore'),
+                        "Failed to restore %s for %s (%s).", param.value, process.process_name, process.pid
+                    )
+                except NoSuchProcess:
+                    break
+
+            if not originals:
+                cls.__originals.pop(process.key)
+
+            restored += is_restored
+
+        if restored:
+            LOG.info(f"Restored the original settings of {restored} processes whose rule no longer applies.")
+
+    @staticmethod
+    def __parameter_value(process: Process, param: ProcessParameter) -> Any:
+        if param == ProcessParameter.AFFINITY:
+            return process.affinity
+        elif param == ProcessParameter.NICE:
+            return process.priority
+        elif param == ProcessParameter.IONICE:
+            return process.io_priority
+
+        return None
+
+    @classmethod
+    def __record_original(
+            cls,
+            process: Process,
+            rule: ProcessRule | ServiceRule,
+            param: ProcessParameter,
+            original: Any
+    ):
+        """
+        Records the value of the parameter before it is changed for the first time, together with the value set
+        by the rule.
+        """
+        if param == ProcessParameter.AFFINITY:
+            isolated = cls.__isolated_processes.get(process.key)
+            original = isolated[0] if isolated else original
+            applied = cls.__rule_affinity(rule)
+        elif param == ProcessParameter.NICE:
+            applied = to_priority[rule.priority]
+        else:
+            applied = to_iopriority[rule.ioPriority]
+
+        originals = cls.__originals.get_or_create(process.key, dict)
+        originals[param] = (originals[param][0] if param in originals else original, applied)
+
+    @staticmethod
+    def __has_cpu_rate(rule: ProcessRule | ServiceRule) -> bool:
+        return bool(rule.cpuLimit or rule.cpuWeight)
+
+    @classmethod
+    def __needs_job(cls, process: Process, compiled: CompiledRule, is_changed: bool) -> bool:
+        """
+        Checks whether the process has to be put into the job object of its rule.
+
+        A delayed process is put into it on the first rule application after its delay, so job objects are only
+        changed from the main loop.
+        """
+        rule = compiled.rule
+
+        if not cls.__has_cpu_rate(rule) or cls.__job_members.get(process.key) == compiled.key:
+            return False
+
+        if cls.__job_denied.get(process.key) == compiled.key:
+            return False
+
+        return rule.delay <= 0 or not (is_changed or TaskScheduler.check_task(process))
+
+    @classmethod
+    def __release_job(cls, key: RuleKey):
+        """
+        Lifts the CPU rate control of the job object of the rule and forgets its processes.
+
+        A process cannot leave a job object, so this is how a process is freed from the limits of a rule that
+        no longer applies to it. The other processes that still match the rule are put into a new job object
+        of the rule, which Windows nests into the released one.
+        """
+        job = cls.__jobs.pop(key, None)
+
+        if job is not None:
+            job.release()
+
+        for process_key, job_key in cls.__job_members.items():
+            if job_key == key:
+                cls.__job_members.pop(process_key)
+
+    @classmethod
+    def __assign_to_jobs(cls, job_moves: dict[RuleKey, list[Process]]):
+        """
+        Puts the processes into the job objects of their rules, which are created once per rule and shared
+        by all processes matched by it.
+        """
+        for key, processes in job_moves.items():
+            compiled = cls.__compiled_rules.get(key)
+
+            if compiled is None:
+                continue
+
+            rule = compiled.rule
+
+            if key not in cls.__jobs:
+                try:
+                    cls.__jobs[key] = JobObject(rule.cpuLimit, rule.cpuWeight)
+                except OSError:
+                    cls.__jobs[key] = None
+                    LOG.exception(f"Failed to create the CPU rate group of the rule `{rule.selector}`.")
+
+            job = cls.__jobs[key]
+
+            if job is None:
+                continue
+
+            moved = 0
+
+            for process in processes:
+                try:
+                    job.assign(process.pid)
+                except AccessDenied:
+                    # Not retried until the process matches another rule, e.g. when it is in a job object that
+                    # cannot be nested with the one of the rule.
+                    cls.__job_denied.put(process.key, key)
+                    RULE_EVENTS_LOG.warning(
+                        (rule.selector, process.bin_path or process.process_name, ProcessParameter.CPU_RATE),
+                        "Failed to set %s for %s (%s).", ProcessParameter.CPU_RATE.value, process.process_name, process.pid
+                    )
+                    continue
+                except NoSuchProcess:
+                    continue
+
+                cls.__job_members.put(process.key, key)
+                moved += 1
+
+            if moved:
+                RULE_EVENTS_LOG.info(
+                    (rule.selector, ProcessParameter.CPU_RATE),
+                    "Set %s `%s` for %d processes of the rule `%s`.",
+                    ProcessParameter.CPU_RATE.value,
+                    f"{rule.cpuLimit:g}%" if rule.cpuLimit else f"weight {rule.cpuWeight}",
+                    moved, rule.selector
+                )
+
+    @classmethod
+    def __restore_matched_rule(cls, process: Process, compiled: Optional[CompiledRule]) -> Optional[RuleKey]:
+        """
+        Returns the rule key restored from the state file for the process, if the process still matches that rule
+        and is already in the state the rule describes.
+        """
+        restored_key = cls.__restored_rules.get(process.key)
+
+        if compiled is None or restored_key != compiled.key:
+            return None
+
+        # Job objects are not shared between runs, so such processes are put into the new ones.
+        if cls.__has_cpu_rate(compiled.rule):
+            return None
+
+        rule = compiled.rule
+        priority = to_priority[rule.priority]
+        io_priority = to_iopriority[rule.ioPriority]
+
+        if priority and process.priority != priority:
+            return None
+
+        if io_priority and process.io_priority != io_priority:
+            return None
+
+        affinity = cls.__rule_affinity(rule)
+
+        if affinity and process.affinity != affinity:
+            return None
+
+        return restored_key
 
     @classmethod
     def __handle_process(cls, process: Process, rule: ProcessRule | ServiceRule):
-        parameter_methods: dict[ProcessParameter, tuple[Callable[[Process, ProcessRule | ServiceRule], bool], str]] = {
-            ProcessParameter.AFFINITY: (cls.__set_affinity, format_affinity(rule.affinity)),
+        parameter_methods: dict[ProcessParameter, tuple[Callable[[Process, ProcessRule | ServiceRule], bool], Any]] = {
+            ProcessParameter.AFFINITY: (cls.__set_affinity, LazyStr(format_affinity_mask, cls.__rule_affinity(rule))),
             ProcessParameter.NICE: (cls.__set_nice, rule.priority),
             ProcessParameter.IONICE: (cls.__set_ionice, rule.ioPriority)
         }
 
         try:
-            ignored_parameters = cls.__ignored_process_parameters.setdefault(process, set())
+            ignored_parameters = cls.__ignored_process_parameters.get_or_create(process.key, set)
 
             for param, (method, logger_value) in parameter_methods.items():
                 if param in ignored_parameters:
                     continue
 
+                backoff_key = (process.key, param)
+
+                if cls.__backoff.is_backing_off(backoff_key):
+                    continue
+
                 service_name = f", {process.service_name}" if process.service else ''
-                logger_string = f"{param.value} `{logger_value}` for {process.process_name} ({process.pid}{service_name})"
+                logger_key = (rule.selector, process.bin_path or process.process_name, param)
+                logger_args = (param.value, logger_value, process.process_name, process.pid, service_name)
 
                 try:
+                    value = cls.__parameter_value(process, param)
+
                     if method(process, rule):
-                        LOG.info(f"Set {logger_string}.")
+                        cls.__record_original(process, rule, param, value)
+                        RULE_EVENTS_LOG.info(logger_key, "Set %s `%s` for %s (%s%s).", *logger_args)
+                        backoff_seconds = cls.__backoff.applied(backoff_key, rule, process.process_name)
+
+                        if backoff_seconds:
+                            RULE_EVENTS_LOG.warning(
+                                (*logger_key, 'backoff'),
+                                "%s (%s) keeps resetting its %s, next attempt in %d seconds.",
+                                process.process_name, process.pid, param.value, backoff_seconds
+                            )
+                    else:
+                        cls.__backoff.stable(backoff_key)
                 except AccessDenied:
                     ignored_parameters.add(param)
-                    LOG.warning(f"Failed to set {logger_string}.")
+                    RULE_EVENTS_LOG.warning(logger_key, "Failed to set %s `%s` for %s (%s%s).", *logger_args)
 
         except NoSuchProcess:
             pass
@@ -116,22 +899,27 @@ class RulesService(ABC):
 
     @classmethod
     def __set_affinity(cls, process: Process, rule: ProcessRule | ServiceRule):
-        if rule.affinity and process.affinity != rule.affinity:
-            process.process.cpu_affinity(rule.affinity)
+        affinity = cls.__rule_affinity(rule)
+
+        if affinity and process.affinity != affinity:
+            process.process.cpu_affinity(list(mask_to_cores(affinity)))
             return True
 
     @classmethod
-    def __first_rule_by_process(cls, config: Config, process: Process) -> Optional[ProcessRule | ServiceRule]:
-        if process.service:
-            for rule in config.serviceRules:
-                if path_match(rule.selector, process.service_name):
-                    return rule
+    def __rule_affinity(cls, rule: ProcessRule | ServiceRule) -> Optional[AffinityMask]:
+        """
+        Returns the affinity of the rule without the cores reserved by isolating rules, unless nothing else is left.
+        """
+        if not rule.affinity or rule.isolate == BoolStr.YES:
+            return rule.affinity
 
-        for rule in config.processRules:
-            value = cls._get_value_for_matching(process, rule)
+        return rule.affinity & ~cls.__reserved_cores or rule.affinity
 
-            if path_match(rule.selector, value):
-                return rule
+    @classmethod
+    def __first_rule_by_process(cls, process: Process) -> Optional[CompiledRule]:
+        for compiled in cls.__matching_rules:
+            if compiled.matches(process):
+                return compiled
 
         return None
 
@@ -169,12 +957,3 @@ class RulesService(ABC):
         message = f"Unknown selector type: {rule.selectorBy}"
         LOG.error(message)
         raise ValueError(message)
-
-    @classmethod
-    @cached(5)  # Workaround to ensure the procedure runs only once every 5 seconds
-    def __light_gc_ignored_process_parameters(cls) -> None:
-        pids = psutil.pids()
-        cls._ignored_process_parameters = {
-            key: value for key, value in cls.__ignored_process_parameters.items()
-            if key.pid in pids
-        }
@@ -0,0 +1,177 @@
+from abc import ABC
+from re import Pattern
+from time import monotonic
+from typing import Optional, Sequence
+
+from psutil import AccessDenied, NoSuchProcess
+
+from configuration.thread_rule import ThreadRule
+from constants.log import RULE_EVENTS_LOG
+from enums.selector import SelectorType
+from enums.thread_priority import to_thread_priority
+from model.process import Process, ProcessKey
+from util.aggregated_log import LazyStr
+from util.bounded_cache import BoundedCache
+from util.cpu import format_affinity_mask
+from util.threads import set_thread_affinity, set_thread_priority, thread_name
+from util.utils import path_pattern_to_regex
+
+_CompiledThreadRule = tuple[ThreadRule, Optional[Pattern], Optional[int], Optional[Pattern]]
+"""
+A thread rule with its compiled process selector, thread index and thread name pattern.
+"""
+
+
+class ThreadRulesService(ABC):
+    """
+    The ThreadRulesService class applies thread rules to the threads of the matching processes.
+
+    The threads of a process are enumerated only if a thread rule matches the process, and at most once every
+    `__SCAN_INTERVAL_SECONDS`. Every thread is handled once, when it is seen for the first time, so only new threads
+    are handled on later scans.
+    """
+
+    __SCAN_INTERVAL_SECONDS = 5
+
+    __rules: Optional[Sequence[ThreadRule]] = None
+    __compiled_rules: list[_CompiledThreadRule] = []
+    __process_rules: BoundedCache[ProcessKey, list[_CompiledThreadRule]] = BoundedCache(65536)
+    __next_scans: BoundedCache[ProcessKey, float] = BoundedCache(16384)
+    __known_threads: BoundedCache[ProcessKey, set[int]] = BoundedCache(16384)
+    __denied: BoundedCache[ProcessKey, bool] = BoundedCache(16384)
+
+    @classmethod
+    def apply(cls, rules: Sequence[ThreadRule], processes: dict[int, Process]):
+        """
+        Applies the thread rules to the new threads of the processes.
+
+        Args:
+            rules (Sequence[ThreadRule]): The thread rules of the configuration. When the list changes, all threads
+                are handled again.
+            processes (dict[int, Process]): The current snapshot of the processes.
+        """
+        if rules is not cls.__rules:
+            cls.__rules = rules
+            cls.__compiled_rules = [cls.__compile(rule) for rule in rules]
+            cls.__process_rules = BoundedCache(65536)
+            cls.__next_scans = BoundedCache(16384)
+            cls.__known_threads = BoundedCache(16384)
+            cls.__denied = BoundedCache(16384)
+
+        if not cls.__compiled_rules:
+            return
+
+        alive = {process.key for process in processes.values()}
+        cls.__process_rules.retain(alive)
+        cls.__next_scans.retain(alive)
+        cls.__known_threads.retain(alive)
+        cls.__denied.retain(alive)
+        now = monotonic()
+
+        for process in processes.values():
+            # The selectors match immutable attributes of the process, so the matching rules are found once.
+            thread_rules = cls.__process_rules.get_or_create(process.key, lambda: [
+                compiled for compiled in cls.__compiled_rules if cls.__matches_process(compiled, process)
+            ])
+
+            if not thread_rules or cls.__denied.get(process.key):
+                continue
+
+            next_scan = cls.__next_scans.get(process.key)
+
+            if next_scan is None or now >= next_scan:
+                cls.__next_scans.put(process.key, now + cls.__SCAN_INTERVAL_SECONDS)
+                cls.__handle_threads(process, thread_rules)
+
+    @staticmethod
+    def __compile(rule: ThreadRule) -> _CompiledThreadRule:
+        thread_selector = rule.threadSelector.strip()
+        index = None
+        name_pattern = None
+
+        if thread_selector.startswith('#') and thread_selector[1:].isdigit():
+            index = int(thread_selector[1:])
+        else:
+            name_pattern = path_pattern_to_regex(thread_selector)
+
+        return rule, path_pattern_to_regex(rule.selector), index, name_pattern
+
+    @staticmethod
+    def __matches_process(compiled: _CompiledThreadRule, process: Process) -> bool:
+        rule, regex, _, _ = compiled
+
+        if rule.selectorBy == SelectorType.PATH:
+            value = process.bin_path
+        elif rule.selectorBy == SelectorType.CMDLINE:
+            value = process.cmd_line
+        else:
+            value = process.process_name
+
+        if value is None or regex is None:
+            return False
+
+        return rule.selector == value or regex.match(value) is not None
+
+    @classmethod
+    def __handle_threads(cls, process: Process, thread_rules: list[_CompiledThreadRule]):
+        try:
+            thread_ids = [thread.id for thread in process.process.threads()]
+        except NoSuchProcess:
+            return
+        except AccessDenied:
+            cls.__denied.put(process.key, True)
+            return
+
+        known_threads = cls.__known_threads.get_or_create(process.key, set)
+        known_threads &= set(thread_ids)
+        uses_names = any(name_pattern is not None for _, _, _, name_pattern in thread_rules)
+
+        for index, tid in enumerate(thread_ids):
+            if tid in known_threads:
+                continue
+
+            known_threads.add(tid)
+
+            try:
+                name = thread_name(process.pid, tid) if uses_names else ''
+                rule = cls.__first_rule_by_thread(thread_rules, index, name)
+
+                if rule is not None:
+                    cls.__handle_thread(process, tid, name, rule)
+            except NoSuchProcess:
+                continue
+            except AccessDenied:
+                RULE_EVENTS_LOG.warning(
+                    (process.bin_path or process.process_name, 'thread name'),
+                    "Failed to read the name of thread %s of %s (%s).", tid, process.process_name, process.pid
+                )
+
+    @staticmethod
+    def __first_rule_by_thread(thread_rules: list[_CompiledThreadRule], index: int, name: str) -> Optional[ThreadRule]:
+        for rule, _, rule_index, name_pattern in thread_rules:
+            if rule_index == index or (name_pattern is not None and name_pattern.match(name)):
+                return rule
+
+        return None
+
+    @staticmethod
+    def __handle_thread(process: Process, tid: int, name: str, rule: ThreadRule):
+        thread = f"thread {tid}{f' `{name}`' if name else ''}"
+        logger_key = (rule.selector, rule.threadSelector, process.bin_path or process.process_name)
+
+        for parameter, value, logger_value, setter in (
+                ('priority', to_thread_priority[rule.priority], rule.priority, set_thread_priority),
+                ('affinity', rule.affinity, LazyStr(format_affinity_mask, rule.affinity), set_thread_affinity)
+        ):
+            if value is None:
+                continue
+
+            logger_args = (parameter, logger_value, thread, process.process_name, process.pid)
+
+            try:
+                setter(process.pid, tid, value)
+                RULE_EVENTS_LOG.info((*logger_key, parameter), "Set thread %s `%s` for %s of %s (%s).", *logger_args)
+            except AccessDenied:
+                RULE_EVENTS_LOG.warning(
+                    (*logger_key, parameter), "Failed to set thread %s `%s` for %s of %s (%s).", *logger_args
+                )
@@ -1,3 +1,5 @@
+import sys
+
 import pystray
 from PIL import Image
 from pystray import MenuItem, Menu
@@ -5,19 +7,29 @@ from pystray._win32 import Icon
 
 from constants.app_info import APP_NAME_WITH_VERSION, APP_TITLE
 from constants.resources import APP_ICON
+from constants.threads import THREAD_UPDATE_CHECK
 from constants.ui import OPEN_LOG_LABEL, OPEN_CONFIG_LABEL
-from ui.settings import open_settings, is_opened_settings, get_settings
 from util.files import open_log_file, open_config_file
+from util.scheduler import TaskScheduler
 from util.startup import toggle_startup, is_in_startup
 from util.updates import check_updates
 from util.utils import is_portable
 
 
+def open_settings():
+    # The settings window pulls in tkinter and all of its widgets, so it is only imported when it is first opened.
+    from ui.settings import open_settings as open_settings_window
+    open_settings_window()
+
+
 def close_app(item):
-    if not is_opened_settings():
+    # If the settings module has never been imported, the settings window has never been opened.
+    settings_module = sys.modules.get('ui.settings')
+
+    if settings_module is None or not settings_module.is_opened_settings():
         return item.stop()
 
-    settings = get_settings()
+    settings = settings_module.get_settings()
 
     def close():
         if settings.close():
@@ -51,7 +63,7 @@ def init_tray() -> Icon:
         ),
         MenuItem(
             'Check for Updates',
-            lambda item: check_updates()
+            lambda item: TaskScheduler.schedule_task(THREAD_UPDATE_CHECK, check_updates)
         ),
         Menu.SEPARATOR,
 
@@ -15,12 +15,15 @@ _anchor_mapping = {
     "right": "e"
 }
 
+_ERRORS_CACHE_SIZE = 4096
+
 
 class PydanticTreeviewLoader:
     def __init__(self, treeview: ExtendedTreeview, model: type[BaseModel]):
         self._treeview = treeview
         self._model = model
         self._original_data = []
+        self._errors_cache: dict[tuple, Optional[Any]] = {}
         self._setup_columns()
 
     def _setup_columns(self):
@@ -98,12 +101,22 @@ class PydanticTreeviewLoader:
         return self._treeview.as_list_of_dict()
 
     def get_error_if_available(self, row_id) -> Optional[tuple[Any, Any]]:
-        try:
-            # noinspection PyCallingNonCallable
-            self._model(**self._treeview.as_dict(row_id))
-            return None
-        except ValidationError as e:
-            return row_id, json.loads(e.json())
+        values = self._treeview.as_dict(row_id)
+        key = tuple(values.items())
+        cache = self._errors_cache
+
+        if key not in cache:
+            if len(cache) >= _ERRORS_CACHE_SIZE:
+                cache.clear()
+
+            try:
+                self._model.model_validate(values)
+                cache[key] = None
+            except ValidationError as e:
+                cache[key] = json.loads(e.json())
+
+        error = cache[key]
+        return None if error is None else (row_id, error)
 
     def get_default_row(self) -> JsonDict:
         treeview = self._treeview
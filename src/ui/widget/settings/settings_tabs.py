@@ -74,12 +74,17 @@ class SettingsTabs(ttk.Notebook):
                 )
                 return False
 
-            for tab in self.frames():
-                if not tab.has_changes():
-                    continue
+            changed_tabs = [tab for tab in self.frames() if tab.has_changes()]
 
+            if not changed_tabs:
+                return True
+
+            for tab in changed_tabs:
                 tab.save_to_config(self._config)
-                ConfigService.save_config_raw(self._config)
+
+            ConfigService.save_config_raw(self._config)
+
+            for tab in changed_tabs:
                 tab.commit_changes()
 
             return True
@@ -0,0 +1,115 @@
+import threading
+from dataclasses import dataclass
+from logging import Logger, INFO, WARNING
+from time import monotonic
+from typing import Any, Callable, Hashable
+
+
+class LazyStr:
+    """
+    A value that is converted to a string only when a log line is actually emitted.
+    """
+
+    __slots__ = ('_function', '_args')
+
+    def __init__(self, function: Callable[..., Any], *args):
+        self._function = function
+        self._args = args
+
+    def __str__(self):
+        return str(self._function(*self._args))
+
+
+@dataclass
+class _Window:
+    started_at: float
+    level: int
+    msg: str
+    args: tuple
+    repeats: int = 0
+
+
+class AggregatedLog:
+    """
+    A rate-limiting layer in front of a logger for repeated events.
+
+    The first event for a key is logged immediately. Repeats of the same key within the window are only counted
+    and reported as one summary line when the window is flushed. Events of different levels are counted separately,
+    so a failure is never folded into the summary of successes. Messages use the `%`-style arguments of `logging`,
+    so formatting is deferred until a line is actually emitted.
+    """
+
+    def __init__(self, logger: Logger, window_seconds: float):
+        self._logger = logger
+        self._window_seconds = window_seconds
+        self._windows: dict[Hashable, _Window] = {}
+        self._lock = threading.Lock()
+
+    def log(self, level: int, key: Hashable, msg: str, *args):
+        """
+        Logs an event or counts it as a repeat if an event with the same key was logged within the window.
+
+        Args:
+            level (int): The logging level.
+            key (Hashable): The key that identifies repeats of the event.
+            msg (str): The message format string.
+            *args: The arguments for the message format string.
+        """
+        if not self._logger.isEnabledFor(level):
+            return
+
+        now = monotonic()
+        key = (key, level)
+
+        with self._lock:
+            window = self._windows.get(key)
+
+            if window is not None and now - window.started_at < self._window_seconds:
+                window.repeats += 1
+                window.msg = msg
+                window.args = args
+                return
+
+            self._windows[key] = _Window(now, level, msg, args)
+
+        if window is not None:
+            self._emit_summary(window)
+
+        self._logger.log(level, msg, *args)
+
+    def info(self, key: Hashable, msg: str, *args):
+        self.log(INFO, key, msg, *args)
+
+    def warning(self, key: Hashable, msg: str, *args):
+        self.log(WARNING, key, msg, *args)
+
+    def flush(self, force: bool = False):
+        """
+        Emits summary lines for the windows that have expired and forgets them.
+
+        Args:
+            force (bool): If True, all windows are flushed regardless of their age.
+        """
+        now = monotonic()
+
+        with self._lock:
+            expired = [
+                key for key, window in self._windows.items()
+                if force or now - window.started_at >= self._window_seconds
+            ]
+            windows = [self._windows.pop(key) for key in expired]
+
+        for window in windows:
+            self._emit_summary(window)
+
+    def _emit_summary(self, window: _Window):
+        if not window.repeats:
+            return
+
+        self._logger.log(
+            window.level,
+            f"{window.msg} Repeated %d times in the last %d seconds.",
+            *window.args,
+            window.repeats,
+            self._window_seconds
+        )
@@ -0,0 +1,27 @@
+import os
+import tempfile
+from contextlib import suppress
+
+
+def write_atomically(path: str, content: bytes):
+    """
+    Replaces the file with the content, so that readers see either the old or the new content but never a part of it.
+
+    The content is written to a temporary file in the same directory, which then replaces the file.
+
+    Args:
+        path (str): The path to the file.
+        content (bytes): The new content of the file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_file_name = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(content)
+
+        os.replace(temp_file_name, path)
+    except BaseException:
+        with suppress(OSError):
+            os.remove(temp_file_name)
+        raise
@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Callable, Hashable, Optional
+
+
+@dataclass
+class OscillationState:
+    """
+    The OscillationState class represents the apply→revert history of one parameter of one process.
+    """
+
+    target: Any
+    """
+    The object describing the applied value (e.g. the rule). A different target resets the history.
+    """
+
+    label: Optional[str] = None
+    """
+    A human-readable description of the key, e.g. the process name.
+    """
+
+    reverts: int = 0
+    """
+    The number of consecutive times the value had to be applied again after it was reverted.
+    """
+
+    backoff_seconds: float = 0
+    """
+    The current backoff duration in seconds, or 0 if the value is not being backed off.
+    """
+
+    backoff_until: float = 0
+    """
+    The `time.monotonic` time until which applying the value is suspended.
+    """
+
+
+class OscillationBackoff:
+    """
+    Detects apply→revert cycles and suspends re-applying with an exponentially growing backoff.
+
+    A value that has to be applied again `threshold` times in a row is considered to be fought over. From then on,
+    every further revert doubles the pause before the next attempt, up to `max_seconds`. A check that finds the value
+    still in place resets the history.
+    """
+
+    def __init__(self, threshold: int = 3, base_seconds: float = 2, max_seconds: float = 300):
+        self._threshold = threshold
+        self._base_seconds = base_seconds
+        self._max_seconds = max_seconds
+        self._states: dict[Hashable, OscillationState] = {}
+
+    def is_backing_off(self, key: Hashable) -> bool:
+        """
+        Checks whether applying the value for the key is currently suspended.
+        """
+        state = self._states.get(key)
+        return state is not None and monotonic() < state.backoff_until
+
+    def applied(self, key: Hashable, target: Any, label: Optional[str] = None) -> Optional[float]:
+        """
+        Records that the value for the key had to be applied.
+
+        Args:
+            key (Hashable): The key of the process parameter.
+            target (Any): The object describing the applied value.
+            label (Optional[str]): A human-readable description of the key.
+
+        Returns:
+            Optional[float]: The backoff duration in seconds if applying is now suspended, otherwise None.
+        """
+        state = self._states.get(key)
+
+        if state is None or state.target is not target:
+            self._states[key] = OscillationState(target, label)
+            return None
+
+        state.reverts += 1
+
+        if state.reverts < self._threshold:
+            return None
+
+        state.backoff_seconds = min(self._base_seconds * 2 ** (state.reverts - self._threshold), self._max_seconds)
+        state.backoff_until = monotonic() + state.backoff_seconds
+
+        return state.backoff_seconds
+
+    def stable(self, key: Hashable):
+        """
+        Records that the value for the key was found in place, which resets its history.
+        """
+        self._states.pop(key, None)
+
+    def retain(self, predicate: Callable[[Hashable], bool]):
+        """
+        Forgets the history of all keys for which the predicate returns False.
+        """
+        self._states = {key: state for key, state in self._states.items() if predicate(key)}
+
+    def fighting(self) -> dict[Hashable, OscillationState]:
+        """
+        Returns the keys whose values are currently considered to be fought over.
+        """
+        return {key: state for key, state in self._states.items() if state.reverts >= self._threshold}
@@ -0,0 +1,118 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Container, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class BoundedCache(Generic[K, V]):
+    """
+    A thread-safe mapping with an upper bound on its size.
+
+    When the bound is reached, the least recently used entry is evicted. Entries can also be expired explicitly
+    with `retain`, for example against the keys of the current process snapshot.
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            value = self._data.get(key)
+
+            if value is not None:
+                self._data.move_to_end(key)
+
+            return value
+
+    def put(self, key: K, value: V):
+        with self._lock:
+            data = self._data
+            data[key] = value
+            data.move_to_end(key)
+
+            while len(data) > self._max_size:
+                data.popitem(last=False)
+
+    def get_or_create(self, key: K, factory: Callable[[], V]) -> V:
+        """
+        Returns the value for the key, creating it with the factory if the key is missing.
+        """
+        with self._lock:
+            data = self._data
+
+            if key in data:
+                data.move_to_end(key)
+                return data[key]
+
+            data[key] = value = factory()
+
+            while len(data) > self._max_size:
+                data.popitem(last=False)
+
+            return value
+
+    def pop(self, key: K) -> Optional[V]:
+        with self._lock:
+            return self._data.pop(key, None)
+
+    def retain(self, keys: Container[K]):
+        """
+        Removes all entries whose keys are not in the given container.
+        """
+        with self._lock:
+            for key in [key for key in self._data if key not in keys]:
+                del self._data[key]
+
+    def items(self) -> list[tuple[K, V]]:
+        """
+        Returns a snapshot of the entries from the least to the most recently used.
+        """
+        with self._lock:
+            return list(self._data.items())
+
+    def __len__(self):
+        return len(self._data)
+
+
+if __name__ == '__main__':
+    from random import Random
+
+    # Simulates a week of process churn: a launcher respawns a helper every second,
+    # while a few hundred long-lived processes stay alive.
+    random = Random(0)
+    cache: BoundedCache[tuple[int, float], set[str]] = BoundedCache(4096)
+    alive: dict[int, float] = {pid: 0.0 for pid in range(4, 1200, 4)}
+    next_pid = 1200
+    max_len = 0
+
+    for second in range(7 * 24 * 60 * 60):
+        victim = random.choice(list(alive))
+        del alive[victim]
+
+        alive[next_pid] = float(second)
+        cache.get_or_create((next_pid, float(second)), set).add("priority")
+        next_pid = next_pid + 4 if next_pid < 65536 else 1200
+
+        if second % 5 == 0:
+            cache.retain({(pid, create_time) for pid, create_time in alive.items()})
+
+        max_len = max(max_len, len(cache))
+
+    print(f"entries after a week: {len(cache)}, max entries: {max_len}, alive processes: {len(alive)}")
+
+    # Between two `retain` calls at most 5 dead processes are left, and the size bound is never needed.
+    assert max_len <= len(alive) + 5, f"the cache keeps dead processes: {max_len} entries"
+    cache.retain({(pid, create_time) for pid, create_time in alive.items()})
+    assert len(cache) <= len(alive), f"dead processes are retained: {len(cache)} > {len(alive)}"
+
+    # Without `retain`, the size bound evicts the least recently used entries.
+    small: BoundedCache[int, int] = BoundedCache(16)
+
+    for key in range(1000):
+        small.put(key, key)
+
+    assert len(small) == 16 and small.get(999) == 999 and small.get(0) is None, "the size bound is not enforced"
@@ -1,7 +1,12 @@
 from functools import lru_cache
-from typing import Optional
+from typing import Iterable, Optional
 
-from psutil import cpu_count
+from util.cpu_topology import AffinityMask, cpu_topology
+
+_INVALID_FORMAT_MESSAGE = (
+    "invalid format. Use range `0-3`, specific cores `0;2;4`, combination `1;3-5`, "
+    "or topology selectors `physical`, `smt:1`, `node:0`, `perf-cores`, `eff-cores`"
+)
 
 
 @lru_cache
@@ -15,6 +20,29 @@ def parse_affinity(in_affinity: str) -> list[int]:
     Returns:
         Optional[list[int]]: A list of CPU core numbers specified in the affinity string.
     """
+    return list(mask_to_cores(parse_affinity_mask(in_affinity)))
+
+
+@lru_cache
+def parse_affinity_mask(in_affinity: str) -> AffinityMask:
+    """
+    Parse a CPU core affinity string into an affinity bitmask.
+
+    The string is a `;`-separated list of elements, each of which is one of:
+        - a core number, e.g. `2`, or a range of core numbers, e.g. `0-3`;
+        - `physical`: the first logical CPU of every physical core;
+        - `smt:N`: the N-th SMT sibling of every physical core (`smt:0` is the same as `physical`);
+        - `node:N`: all logical CPUs of NUMA node N;
+        - `perf-cores` / `eff-cores`: the performance / efficiency cores of a hybrid CPU.
+
+    Topology selectors are resolved against the topology of the current machine.
+
+    Args:
+        in_affinity (str): The CPU core affinity string to parse.
+
+    Returns:
+        AffinityMask: The bitmask of the selected cores.
+    """
     if in_affinity is None:
         raise ValueError("empty value")
 
@@ -23,24 +51,42 @@ def parse_affinity(in_affinity: str) -> list[int]:
     if not affinity:
         raise ValueError("empty string")
 
-    affinity = affinity.split(";")
-    cores: list[int] = []
+    topology = cpu_topology()
+    mask = 0
+
+    for el in affinity.split(";"):
+        el = el.strip().lower()
+
+        if el == 'physical':
+            mask |= topology.smt_threads(0)
+        elif el == 'perf-cores':
+            mask |= topology.performance_cores()
+        elif el == 'eff-cores':
+            mask |= topology.efficiency_cores()
+        elif el.startswith('smt:'):
+            mask |= topology.smt_threads(_parse_index(el[len('smt:'):]))
+        elif el.startswith('node:'):
+            mask |= topology.node(_parse_index(el[len('node:'):]))
+        else:
+            bounds = [_parse_index(bound) for bound in el.split('-')]
 
-    try:
-        for el in affinity:
-            el = list(map(str.strip, el.split('-')))
-
-            if len(el) == 2:
-                cores.extend(range(int(el[0]), int(el[1]) + 1))
-            elif len(el) == 1:
-                cores.append(int(el[0]))
-            else:
-                raise ValueError("incorrect format")
-    except Exception:
-        raise ValueError("invalid format. Use range `0-3`, specific cores `0;2;4`, or combination `1;3-5`")
+            if len(bounds) > 2:
+                raise ValueError(_INVALID_FORMAT_MESSAGE)
 
-    _check_max_cpu_index(cores)
-    return cores
+            mask |= cores_to_mask(range(bounds[0], bounds[-1] + 1))
+
+    if not mask:
+        raise ValueError(f"`{in_affinity.strip()}` selects no cores on this machine")
+
+    _check_max_cpu_index(mask_to_cores(mask))
+    return mask
+
+
+def _parse_index(value: str) -> int:
+    try:
+        return int(value.strip())
+    except ValueError:
+        raise ValueError(_INVALID_FORMAT_MESSAGE)
 
 
 def format_affinity(cores: list[int]) -> Optional[str]:
@@ -86,8 +132,58 @@ def format_affinity(cores: list[int]) -> Optional[str]:
     return result
 
 
+def cores_to_mask(cores: Optional[Iterable[int]]) -> Optional[AffinityMask]:
+    """
+    Converts a list of CPU core numbers to an affinity bitmask.
+
+    Args:
+        cores (Optional[Iterable[int]]): The CPU core numbers in any order, possibly with duplicates.
+
+    Returns:
+        Optional[AffinityMask]: The bitmask, or None if the cores are None.
+    """
+    if cores is None:
+        return None
+
+    mask = 0
+
+    for core in cores:
+        if core < 0:
+            raise ValueError(f"negative core index {core}")
+
+        mask |= 1 << core
+
+    return mask
+
+
+@lru_cache
+def mask_to_cores(mask: AffinityMask) -> tuple[int, ...]:
+    """
+    Converts an affinity bitmask to the CPU core numbers in ascending order.
+    """
+    cores = []
+
+    while mask:
+        lowest_bit = mask & -mask
+        cores.append(lowest_bit.bit_length() - 1)
+        mask ^= lowest_bit
+
+    return tuple(cores)
+
+
+@lru_cache
+def format_affinity_mask(mask: Optional[AffinityMask]) -> Optional[str]:
+    """
+    Format an affinity bitmask into an affinity string.
+    """
+    if not mask:
+        return None
+
+    return format_affinity(list(mask_to_cores(mask)))
+
+
 def _check_max_cpu_index(cores):
-    available_cores = cpu_count()
+    available_cores = cpu_topology().logical_count
 
     if max(cores) >= available_cores:
         raise ValueError(
@@ -97,12 +193,25 @@ def _check_max_cpu_index(cores):
 
 
 if __name__ == '__main__':
+    for selector in ["physical", "smt:1", "node:0", "perf-cores", "eff-cores", "physical;node:0"]:
+        try:
+            print(selector, format_affinity_mask(parse_affinity_mask(selector)))
+        except ValueError as e:
+            print(selector, e)
+
     input = "1 ; 3- 5"
     lst = parse_affinity("1;3-5")
     fmt = format_affinity(lst)
 
     print(input, lst, fmt)
 
+    mask = parse_affinity_mask("1;3-5")
+    print(bin(mask), mask_to_cores(mask), mask == cores_to_mask([5, 4, 3, 1, 3]))
+
+    # Machines with more than 64 logical CPUs need masks wider than a machine word.
+    wide_mask = cores_to_mask([0, 63, 64, 127])
+    print(hex(wide_mask), mask_to_cores(wide_mask))
+
     example_inputs = [[], [0], [1, 2, 3], [0, 2, 4], [1, 3, 4, 5], None]
     for example_cores in example_inputs:
         try:
@@ -0,0 +1,264 @@
+import ctypes
+import glob
+import os
+import sys
+from dataclasses import dataclass
+from functools import cache
+from typing import Optional
+
+from psutil import cpu_count
+
+AffinityMask = int
+"""
+CPU core affinity as a bitmask of arbitrary width, where bit N allows logical CPU N.
+"""
+
+
+@dataclass(frozen=True)
+class CpuTopology:
+    """
+    The CpuTopology class describes how the logical CPUs of the machine are grouped.
+    """
+
+    logical_count: int
+    """
+    The number of logical CPUs.
+    """
+
+    cores: tuple[AffinityMask, ...]
+    """
+    The logical CPUs of every physical core, ordered by the lowest logical CPU.
+    """
+
+    nodes: tuple[tuple[int, AffinityMask], ...]
+    """
+    The logical CPUs of every NUMA node by node number.
+    """
+
+    core_classes: tuple[int, ...]
+    """
+    The efficiency class of every physical core in the order of `cores`. A higher class means a more performant core.
+    """
+
+    def smt_threads(self, index: int) -> AffinityMask:
+        """
+        Returns the `index`-th logical CPU (SMT thread) of every physical core that has one.
+        """
+        mask = 0
+
+        for core in self.cores:
+            for _ in range(index):
+                core &= core - 1
+
+            mask |= core & -core
+
+        return mask
+
+    def node(self, number: int) -> AffinityMask:
+        for node_number, mask in self.nodes:
+            if node_number == number:
+                return mask
+
+        raise ValueError(f"NUMA node {number} does not exist, available nodes: {[n for n, _ in self.nodes]}")
+
+    def performance_cores(self) -> AffinityMask:
+        """
+        Returns the logical CPUs of the cores of the highest efficiency class, i.e. all cores if the CPU is not hybrid.
+        """
+        return self.__cores_of_class(max(self.core_classes, default=0))
+
+    def efficiency_cores(self) -> AffinityMask:
+        """
+        Returns the logical CPUs of the cores of the lowest efficiency class, or none if the CPU is not hybrid.
+        """
+        if len(set(self.core_classes)) < 2:
+            return 0
+
+        return self.__cores_of_class(min(self.core_classes))
+
+    def __cores_of_class(self, core_class: int) -> AffinityMask:
+        mask = 0
+
+        for core, current_class in zip(self.cores, self.core_classes):
+            if current_class == core_class:
+                mask |= core
+
+        return mask
+
+
+@cache
+def cpu_topology() -> CpuTopology:
+    """
+    Returns the CPU topology of the machine, which is read once per run.
+
+    Falls back to a flat topology (one logical CPU per core, a single NUMA node) if the platform does not provide it.
+    """
+    logical_count = cpu_count() or 1
+
+    try:
+        if sys.platform == 'win32':
+            topology = _read_windows_topology(logical_count)
+        else:
+            topology = _read_linux_topology(logical_count)
+
+        if topology is not None:
+            return topology
+    except (OSError, ValueError):
+        pass
+
+    return _flat_topology(logical_count)
+
+
+def _flat_topology(logical_count: int) -> CpuTopology:
+    return CpuTopology(
+        logical_count,
+        tuple(1 << cpu for cpu in range(logical_count)),
+        ((0, (1 << logical_count) - 1),),
+        (0,) * logical_count
+    )
+
+
+def _parse_cpu_list(value: str) -> AffinityMask:
+    """
+    Parses a Linux CPU list such as `0-3,8,10-11`.
+    """
+    mask = 0
+
+    for part in value.strip().split(','):
+        if not part:
+            continue
+
+        first, _, last = part.partition('-')
+        mask |= ((1 << (int(last or first) - int(first) + 1)) - 1) << int(first)
+
+    return mask
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding='ascii') as file:
+            return file.read()
+    except OSError:
+        return None
+
+
+def _read_linux_topology(logical_count: int) -> Optional[CpuTopology]:
+    cores: set[AffinityMask] = set()
+
+    for path in glob.glob('/sys/devices/system/cpu/cpu[0-9]*/topology/thread_siblings_list'):
+        cores.add(_parse_cpu_list(_read_text(path) or ''))
+
+    cores.discard(0)
+
+    if not cores:
+        return None
+
+    nodes = []
+
+    for path in glob.glob('/sys/devices/system/node/node[0-9]*/cpulist'):
+        node_number = int(os.path.basename(os.path.dirname(path))[len('node'):])
+        nodes.append((node_number, _parse_cpu_list(_read_text(path) or '')))
+
+    if not nodes:
+        nodes.append((0, (1 << logical_count) - 1))
+
+    # Hybrid Intel CPUs expose their performance and efficiency cores as separate PMUs.
+    performance_cpus = _parse_cpu_list(_read_text('/sys/devices/cpu_core/cpus') or '')
+    sorted_cores = tuple(sorted(cores, key=lambda core: core & -core))
+    core_classes = tuple(1 if core & performance_cpus else 0 for core in sorted_cores)
+
+    if not performance_cpus:
+        core_classes = (0,) * len(sorted_cores)
+
+    return CpuTopology(logical_count, sorted_cores, tuple(sorted(nodes)), core_classes)
+
+
+_RELATION_PROCESSOR_CORE = 0
+_RELATION_NUMA_NODE = 1
+_RELATION_GROUP = 4
+_RELATION_ALL = 0xffff
+_ERROR_INSUFFICIENT_BUFFER = 122
+
+
+def _read_windows_topology(logical_count: int) -> Optional[CpuTopology]:
+    """
+    Reads the topology with `GetLogicalProcessorInformationEx`.
+
+    Logical CPUs of processor groups are numbered consecutively, group after group, as `psutil.cpu_count` counts them.
+    """
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    length = ctypes.c_uint32(0)
+
+    kernel32.GetLogicalProcessorInformationEx(_RELATION_ALL, None, ctypes.byref(length))
+
+    if ctypes.get_last_error() != _ERROR_INSUFFICIENT_BUFFER:
+        return None
+
+    buffer = ctypes.create_string_buffer(length.value)
+
+    if not kernel32.GetLogicalProcessorInformationEx(_RELATION_ALL, buffer, ctypes.byref(length)):
+        return None
+
+    data = buffer.raw[:length.value]
+    records: list[tuple[int, int]] = []
+    offset = 0
+
+    while offset < len(data):
+        relationship = int.from_bytes(data[offset:offset + 4], 'little')
+        size = int.from_bytes(data[offset + 4:offset + 8], 'little')
+        records.append((relationship, offset))
+        offset += size
+
+    group_offsets: list[int] = []
+
+    for relationship, record in records:
+        if relationship == _RELATION_GROUP:
+            active_groups = int.from_bytes(data[record + 10:record + 12], 'little')
+            first_cpu = 0
+
+            for group in range(active_groups):
+                group_offsets.append(first_cpu)
+                first_cpu += data[record + 32 + group * 48 + 1]
+
+    def to_mask(record: int) -> AffinityMask:
+        # Both PROCESSOR_RELATIONSHIP and NUMA_NODE_RELATIONSHIP keep GroupCount at 30 and the GROUP_AFFINITY array at 32.
+        group_count = max(1, int.from_bytes(data[record + 30:record + 32], 'little'))
+        mask = 0
+
+        for index in range(group_count):
+            group_affinity = record + 32 + index * 16
+            group_mask = int.from_bytes(data[group_affinity:group_affinity + 8], 'little')
+            group = int.from_bytes(data[group_affinity + 8:group_affinity + 10], 'little')
+            mask |= group_mask << (group_offsets[group] if group < len(group_offsets) else group * 64)
+
+        return mask
+
+    cores: list[tuple[AffinityMask, int]] = []
+    nodes: list[tuple[int, AffinityMask]] = []
+
+    for relationship, record in records:
+        if relationship == _RELATION_PROCESSOR_CORE:
+            cores.append((to_mask(record), data[record + 9]))
+        elif relationship == _RELATION_NUMA_NODE:
+            nodes.append((int.from_bytes(data[record + 8:record + 12], 'little'), to_mask(record)))
+
+    if not cores:
+        return None
+
+    cores.sort(key=lambda core: core[0] & -core[0])
+
+    return CpuTopology(
+        logical_count,
+        tuple(mask for mask, _ in cores),
+        tuple(sorted(nodes)) or ((0, (1 << logical_count) - 1),),
+        tuple(core_class for _, core_class in cores)
+    )
+
+
+if __name__ == '__main__':
+    topology = cpu_topology()
+
+    print(f"logical CPUs: {topology.logical_count}, physical cores: {len(topology.cores)}")
+    print(f"physical: {bin(topology.smt_threads(0))}, smt:1: {bin(topology.smt_threads(1))}")
+    print(f"nodes: {[(number, bin(mask)) for number, mask in topology.nodes]}")
+    print(f"perf-cores: {bin(topology.performance_cores())}, eff-cores: {bin(topology.efficiency_cores())}")
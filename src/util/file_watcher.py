@@ -0,0 +1,157 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from time import monotonic
+from typing import Callable, Optional
+
+from constants.log import LOG
+
+FileSignature = tuple[int, int]
+"""
+The modification time (in nanoseconds) and the size of a file.
+"""
+
+
+def file_signature(path: str) -> Optional[FileSignature]:
+    """
+    Returns the signature of the file, or None if the file does not exist.
+    """
+    try:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+    except FileNotFoundError:
+        return None
+
+
+class FileWatcher(ABC):
+    """
+    Watches a single file in a background thread and calls `on_change` once per burst of writes.
+
+    A change is reported after the file signature has stayed the same for `debounce_seconds`, so an editor that
+    writes the file in several steps causes a single notification.
+    """
+
+    def __init__(self, path: str, on_change: Callable[[], None], debounce_seconds: float = 0.2):
+        self._path = os.path.abspath(path)
+        self._on_change = on_change
+        self._debounce_seconds = debounce_seconds
+        self._signature = file_signature(self._path)
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        try:
+            self._watch()
+        except BaseException:
+            LOG.exception(f"Watching `{self._path}` failed, falling back to polling.")
+            self._poll(1)
+
+    @abstractmethod
+    def _watch(self):
+        pass
+
+    def _poll(self, interval_seconds: float):
+        while not self._stopped.wait(interval_seconds):
+            if file_signature(self._path) != self._signature:
+                self._check()
+
+    def _check(self):
+        """
+        Waits until the file stops changing and reports it if its signature differs from the last reported one.
+        """
+        signature = file_signature(self._path)
+        settled_at = monotonic() + self._debounce_seconds
+
+        while not self._stopped.wait(max(0.0, settled_at - monotonic())):
+            current = file_signature(self._path)
+
+            if current == signature:
+                break
+
+            signature = current
+            settled_at = monotonic() + self._debounce_seconds
+
+        if signature != self._signature:
+            self._signature = signature
+            self._on_change()
+
+
+class PollingFileWatcher(FileWatcher):
+    """
+    A file watcher that compares the file signature at a fixed interval.
+    """
+
+    def __init__(self, path: str, on_change: Callable[[], None], interval_seconds: float = 1, **kwargs):
+        super().__init__(path, on_change, **kwargs)
+        self._interval_seconds = interval_seconds
+
+    def _watch(self):
+        self._poll(self._interval_seconds)
+
+
+class WindowsFileWatcher(FileWatcher):
+    """
+    A file watcher based on directory change notifications of Windows.
+    """
+
+    _WAIT_TIMEOUT_MS = 500
+
+    def _watch(self):
+        import win32con
+        import win32event
+        import win32file
+
+        handle = win32file.FindFirstChangeNotification(
+            os.path.dirname(self._path),
+            False,
+            win32con.FILE_NOTIFY_CHANGE_FILE_NAME
+            | win32con.FILE_NOTIFY_CHANGE_LAST_WRITE
+            | win32con.FILE_NOTIFY_CHANGE_SIZE
+        )
+
+        try:
+            while not self._stopped.is_set():
+                result = win32event.WaitForSingleObject(handle, self._WAIT_TIMEOUT_MS)
+
+                if result != win32event.WAIT_OBJECT_0:
+                    continue
+
+                win32file.FindNextChangeNotification(handle)
+
+                # Notifications are per directory, so changes of other files (e.g. the log) are filtered out here.
+                if file_signature(self._path) != self._signature:
+                    self._check()
+        finally:
+            win32file.FindCloseChangeNotification(handle)
+
+
+def create_file_watcher(path: str, on_change: Callable[[], None]) -> FileWatcher:
+    """
+    Creates and starts the most efficient file watcher available, falling back to polling.
+
+    Args:
+        path (str): The path to the file to watch.
+        on_change (Callable[[], None]): The callback called from the watcher thread when the file has changed.
+
+    Returns:
+        FileWatcher: The started file watcher.
+    """
+    watcher: FileWatcher
+
+    try:
+        import win32file  # noqa: F401
+
+        watcher = WindowsFileWatcher(path, on_change)
+    except ImportError:
+        LOG.warning(f"Change notifications are not available, falling back to polling `{path}`.")
+        watcher = PollingFileWatcher(path, on_change)
+
+    watcher.start()
+    return watcher
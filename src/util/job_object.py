@@ -0,0 +1,126 @@
+import ctypes
+from ctypes import wintypes
+from typing import Optional
+
+from psutil import AccessDenied, NoSuchProcess
+
+_JOB_OBJECT_CPU_RATE_CONTROL_INFORMATION = 15
+
+_CPU_RATE_CONTROL_ENABLE = 0x1
+_CPU_RATE_CONTROL_WEIGHT_BASED = 0x2
+_CPU_RATE_CONTROL_HARD_CAP = 0x4
+
+_PROCESS_TERMINATE = 0x0001
+_PROCESS_SET_QUOTA = 0x0100
+
+_ERROR_INVALID_PARAMETER = 87
+
+
+class _CpuRateControlInformation(ctypes.Structure):
+    # The union of CpuRate and Weight is a single DWORD.
+    _fields_ = [('ControlFlags', wintypes.DWORD), ('Value', wintypes.DWORD)]
+
+
+_kernel32: Optional['ctypes.WinDLL'] = None
+
+
+def _kernel32_functions() -> 'ctypes.WinDLL':
+    global _kernel32
+
+    if _kernel32 is None:
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.CreateJobObjectW.restype = wintypes.HANDLE
+        kernel32.CreateJobObjectW.argtypes = [wintypes.LPVOID, wintypes.LPCWSTR]
+        kernel32.SetInformationJobObject.argtypes = [wintypes.HANDLE, ctypes.c_int, wintypes.LPVOID, wintypes.DWORD]
+        kernel32.OpenProcess.restype = wintypes.HANDLE
+        kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        kernel32.AssignProcessToJobObject.argtypes = [wintypes.HANDLE, wintypes.HANDLE]
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        _kernel32 = kernel32
+
+    return _kernel32
+
+
+class JobObject:
+    """
+    The JobObject class wraps an anonymous Windows job object used to limit the CPU time of a group of processes.
+
+    A process cannot leave a job object, so the limits are lifted with `release` rather than by removing processes.
+    """
+
+    def __init__(self, cpu_limit: Optional[float], cpu_weight: Optional[int]):
+        """
+        Creates the job object with its CPU rate control.
+
+        Args:
+            cpu_limit (Optional[float]): The hard cap in percent of all CPU cores, which takes precedence over the weight.
+            cpu_weight (Optional[int]): The scheduling weight from 1 to 9.
+
+        Raises:
+            OSError: If the job object cannot be created or configured.
+        """
+        kernel32 = _kernel32_functions()
+        self._handle = kernel32.CreateJobObjectW(None, None)
+
+        if not self._handle:
+            raise ctypes.WinError(ctypes.get_last_error())
+
+        try:
+            if cpu_limit:
+                self._set_cpu_rate(
+                    _CPU_RATE_CONTROL_ENABLE | _CPU_RATE_CONTROL_HARD_CAP,
+                    max(1, round(cpu_limit * 100))
+                )
+            elif cpu_weight:
+                self._set_cpu_rate(_CPU_RATE_CONTROL_ENABLE | _CPU_RATE_CONTROL_WEIGHT_BASED, cpu_weight)
+        except OSError:
+            kernel32.CloseHandle(self._handle)
+            raise
+
+    def assign(self, pid: int):
+        """
+        Puts the process into the job object.
+
+        Raises:
+            NoSuchProcess: If the process no longer exists.
+            AccessDenied: If the process cannot be opened or put into the job object.
+        """
+        kernel32 = _kernel32_functions()
+        process_handle = kernel32.OpenProcess(_PROCESS_SET_QUOTA | _PROCESS_TERMINATE, False, pid)
+
+        if not process_handle:
+            error = ctypes.get_last_error()
+
+            if error == _ERROR_INVALID_PARAMETER:
+                raise NoSuchProcess(pid)
+
+            raise AccessDenied(pid, msg=str(ctypes.WinError(error)))
+
+        try:
+            if not kernel32.AssignProcessToJobObject(self._handle, process_handle):
+                raise AccessDenied(pid, msg=str(ctypes.WinError(ctypes.get_last_error())))
+        finally:
+            kernel32.CloseHandle(process_handle)
+
+    def release(self):
+        """
+        Lifts the CPU rate control from the processes of the job object and closes it.
+        """
+        if not self._handle:
+            return
+
+        try:
+            self._set_cpu_rate(0, 0)
+        except OSError:
+            pass
+
+        _kernel32_functions().CloseHandle(self._handle)
+        self._handle = None
+
+    def _set_cpu_rate(self, flags: int, value: int):
+        info = _CpuRateControlInformation(flags, value)
+
+        if not _kernel32_functions().SetInformationJobObject(
+                self._handle, _JOB_OBJECT_CPU_RATE_CONTROL_INFORMATION, ctypes.byref(info), ctypes.sizeof(info)
+        ):
+            raise ctypes.WinError(ctypes.get_last_error())
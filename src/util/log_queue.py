@@ -0,0 +1,130 @@
+import threading
+from logging import Handler, LogRecord, Logger, StreamHandler, WARNING
+from logging.handlers import QueueHandler, RotatingFileHandler
+from queue import Queue, Full, Empty
+from typing import Optional
+
+
+class BatchFlushMixin:
+    """
+    Mixin for stream-based handlers that postpones flushing until `flush_batch` is called.
+
+    The background writer calls `flush_batch` once per drained batch instead of flushing after every record.
+    """
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        # noinspection PyUnresolvedReferences
+        super().flush()
+
+
+class BatchStreamHandler(BatchFlushMixin, StreamHandler):
+    pass
+
+
+class BatchRotatingFileHandler(BatchFlushMixin, RotatingFileHandler):
+    pass
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    A queue handler that never blocks the caller.
+
+    Records that do not fit into the bounded queue are dropped and counted in `dropped`.
+    """
+
+    def __init__(self, queue: Queue):
+        super().__init__(queue)
+
+        self.dropped: int = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        # The queue never leaves the process, so formatting is left to the background writer.
+        return record
+
+    def enqueue(self, record: LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def take_dropped(self) -> int:
+        """
+        Returns the number of dropped records since the previous call and resets the counter.
+        """
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+
+        return dropped
+
+
+class BatchQueueListener:
+    """
+    Background writer that drains the log queue in batches and flushes every handler once per batch.
+    """
+
+    _SENTINEL = None
+
+    def __init__(self, logger: Logger, queue_handler: DroppingQueueHandler, handlers: list[Handler], batch_size: int):
+        self._logger = logger
+        self._queue: Queue = queue_handler.queue
+        self._queue_handler = queue_handler
+        self._handlers = handlers
+        self._batch_size = batch_size
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = thread = threading.Thread(target=self._monitor, name="log-writer", daemon=True)
+        thread.start()
+
+    def stop(self):
+        """
+        Writes out all queued records and stops the background writer.
+        """
+        if not self._thread:
+            return
+
+        self._queue.put(self._SENTINEL)
+        self._thread.join()
+        self._thread = None
+
+    def _monitor(self):
+        queue = self._queue
+
+        while True:
+            batch = [queue.get()]
+
+            try:
+                while len(batch) < self._batch_size:
+                    batch.append(queue.get_nowait())
+            except Empty:
+                pass
+
+            stop = self._SENTINEL in batch
+            self._write([record for record in batch if record is not self._SENTINEL])
+
+            if stop:
+                return
+
+    def _write(self, records: list[LogRecord]):
+        dropped = self._queue_handler.take_dropped()
+
+        if dropped:
+            records.append(self._logger.makeRecord(
+                self._logger.name, WARNING, __file__, 0,
+                "%d log records were dropped because the log queue was full.", (dropped,), None
+            ))
+
+        for handler in self._handlers:
+            for record in records:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+            if isinstance(handler, BatchFlushMixin):
+                handler.flush_batch()
+            else:
+                handler.flush()
@@ -0,0 +1,98 @@
+import operator
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+
+import psutil
+
+LoadCondition = tuple[str, str, float]
+"""
+A condition on the system load: the metric, the comparison operator and the threshold, e.g. `('cpu', '>', 80.0)`.
+"""
+
+_METRICS = ('cpu', 'memory', 'availableMemory')
+_OPERATORS: dict[str, Callable[[float, float], bool]] = {
+    '>=': operator.ge,
+    '<=': operator.le,
+    '>': operator.gt,
+    '<': operator.lt,
+}
+_CONDITION_PATTERN = re.compile(r'^\s*([A-Za-z]+)\s*(>=|<=|>|<)\s*(\d+(?:\.\d+)?)\s*$')
+_INVALID_FORMAT_MESSAGE = (
+    "invalid format. Use `metric>value` or `metric<value` separated by `;`, "
+    f"where the metric is one of: {', '.join(_METRICS)}"
+)
+
+
+@dataclass(frozen=True)
+class SystemLoad:
+    """
+    The SystemLoad class represents a sample of the system load.
+    """
+
+    cpu: float
+    """
+    The total CPU usage in percent since the previous sample.
+    """
+
+    memory: float
+    """
+    The used physical memory in percent.
+    """
+
+    availableMemory: float
+    """
+    The available physical memory in megabytes.
+    """
+
+    def matches(self, condition: LoadCondition) -> bool:
+        metric, op, value = condition
+        return _OPERATORS[op](getattr(self, metric), value)
+
+
+def sample_system_load() -> SystemLoad:
+    """
+    Samples the system load. The CPU usage is measured since the previous call, so the first sample reads zero.
+    """
+    memory = psutil.virtual_memory()
+    return SystemLoad(psutil.cpu_percent(), memory.percent, memory.available / 2 ** 20)
+
+
+@lru_cache
+def parse_condition(value: str) -> tuple[LoadCondition, ...]:
+    """
+    Parses a condition string such as `cpu>80;availableMemory<2048`, which holds if all its parts hold.
+
+    Raises:
+        ValueError: If the format is invalid.
+    """
+    conditions = []
+
+    for part in value.split(';'):
+        match = _CONDITION_PATTERN.match(part)
+
+        if not match or match.group(1) not in _METRICS:
+            raise ValueError(_INVALID_FORMAT_MESSAGE)
+
+        metric, op, threshold = match.groups()
+        conditions.append((metric, op, float(threshold)))
+
+    return tuple(conditions)
+
+
+def format_condition(conditions: tuple[LoadCondition, ...]) -> str:
+    return ';'.join(f"{metric}{op}{threshold:g}" for metric, op, threshold in conditions)
+
+
+if __name__ == '__main__':
+    from time import sleep
+
+    sample_system_load()
+    sleep(0.5)
+
+    load = sample_system_load()
+    print(load)
+
+    for text in ('cpu>80', 'memory >= 50', 'availableMemory<2048;cpu<5'):
+        print(f"{text!r}: {all(load.matches(condition) for condition in parse_condition(text))}")
@@ -0,0 +1,122 @@
+import ctypes
+from ctypes import wintypes
+from typing import Optional
+
+from psutil import AccessDenied, NoSuchProcess
+
+from util.cpu_topology import AffinityMask
+
+_THREAD_SET_INFORMATION = 0x0020
+_THREAD_QUERY_INFORMATION = 0x0040
+_THREAD_QUERY_LIMITED_INFORMATION = 0x0800
+
+_ERROR_INVALID_PARAMETER = 87
+
+_kernel32: Optional['ctypes.WinDLL'] = None
+
+
+def _kernel32_functions() -> 'ctypes.WinDLL':
+    global _kernel32
+
+    if _kernel32 is None:
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.OpenThread.restype = wintypes.HANDLE
+        kernel32.OpenThread.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        kernel32.SetThreadPriority.argtypes = [wintypes.HANDLE, ctypes.c_int]
+        kernel32.SetThreadAffinityMask.restype = ctypes.c_size_t
+        kernel32.SetThreadAffinityMask.argtypes = [wintypes.HANDLE, ctypes.c_size_t]
+        kernel32.LocalFree.argtypes = [wintypes.HLOCAL]
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+        # Available since Windows 10 1607.
+        if hasattr(kernel32, 'GetThreadDescription'):
+            kernel32.GetThreadDescription.restype = ctypes.c_long
+            kernel32.GetThreadDescription.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.LPWSTR)]
+
+        _kernel32 = kernel32
+
+    return _kernel32
+
+
+def _open_thread(access: int, pid: int, tid: int) -> int:
+    handle = _kernel32_functions().OpenThread(access, False, tid)
+
+    if not handle:
+        error = ctypes.get_last_error()
+
+        if error == _ERROR_INVALID_PARAMETER:
+            raise NoSuchProcess(pid, msg=f"thread {tid} no longer exists")
+
+        raise AccessDenied(pid, msg=str(ctypes.WinError(error)))
+
+    return handle
+
+
+def thread_name(pid: int, tid: int) -> str:
+    """
+    Returns the name (description) of the thread, or an empty string if it has none.
+
+    Raises:
+        NoSuchProcess: If the thread no longer exists.
+        AccessDenied: If the thread cannot be opened.
+    """
+    kernel32 = _kernel32_functions()
+
+    if not hasattr(kernel32, 'GetThreadDescription'):
+        return ''
+
+    handle = _open_thread(_THREAD_QUERY_LIMITED_INFORMATION, pid, tid)
+    description = wintypes.LPWSTR()
+
+    try:
+        if kernel32.GetThreadDescription(handle, ctypes.byref(description)) < 0:
+            return ''
+
+        try:
+            return description.value or ''
+        finally:
+            kernel32.LocalFree(description)
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def set_thread_priority(pid: int, tid: int, priority: int):
+    """
+    Sets the priority of the thread relative to the priority class of its process.
+
+    Raises:
+        NoSuchProcess: If the thread no longer exists.
+        AccessDenied: If the priority cannot be set.
+    """
+    kernel32 = _kernel32_functions()
+    handle = _open_thread(_THREAD_SET_INFORMATION | _THREAD_QUERY_INFORMATION, pid, tid)
+
+    try:
+        if not kernel32.SetThreadPriority(handle, priority):
+            raise AccessDenied(pid, msg=str(ctypes.WinError(ctypes.get_last_error())))
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def set_thread_affinity(pid: int, tid: int, mask: AffinityMask):
+    """
+    Sets the CPU core affinity of the thread.
+
+    Only the cores of the first processor group (the first 64 logical cores) can be set, and the mask must be
+    a subset of the affinity of the process.
+
+    Raises:
+        NoSuchProcess: If the thread no longer exists.
+        AccessDenied: If the affinity cannot be set.
+    """
+    if mask >> (ctypes.sizeof(ctypes.c_size_t) * 8):
+        raise AccessDenied(pid, msg="thread affinity is limited to the first processor group")
+
+    kernel32 = _kernel32_functions()
+    handle = _open_thread(_THREAD_SET_INFORMATION | _THREAD_QUERY_INFORMATION, pid, tid)
+
+    try:
+        if not kernel32.SetThreadAffinityMask(handle, mask):
+            raise AccessDenied(pid, msg=str(ctypes.WinError(ctypes.get_last_error())))
+    finally:
+        kernel32.CloseHandle(handle)
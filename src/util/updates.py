@@ -1,36 +1,102 @@
 import json
+import time
 import webbrowser
 from typing import Optional, Union
 from urllib import request
 
 from constants.app_info import CURRENT_TAG, APP_NAME
-from constants.updates import API_UPDATE_URL, UPDATE_URL
+from constants.files import UPDATE_CHECK_CACHE_FILE_NAME
+from constants.log import LOG
+from constants.updates import API_UPDATE_URL, UPDATE_URL, UPDATE_CHECK_TIMEOUT_SECONDS, \
+    UPDATE_CHECK_CACHE_TTL_SECONDS
 from util.messages import show_error, show_info, yesno_info_box
 from util.utils import compare_version
 
 
-def check_new_version() -> Optional[Union[str, bool]]:
+def fetch_latest_tag(url: str = API_UPDATE_URL, timeout: float = UPDATE_CHECK_TIMEOUT_SECONDS) -> Optional[str]:
+    """
+    Requests the tag of the latest release.
+
+    Args:
+        url (str): The URL of the latest release in the format of the GitHub API.
+        timeout (float): The timeout of the request in seconds.
+
+    Returns:
+        Optional[str]: The tag of the latest release, or None if the request fails.
+    """
+    try:
+        with request.urlopen(url, timeout=timeout) as response:
+            return json.loads(response.read().decode())['tag_name']
+    except Exception as e:
+        LOG.warning(f"Failed to check for updates: {e}")
+        return None
+
+
+def load_cached_latest_tag(ttl_seconds: float = UPDATE_CHECK_CACHE_TTL_SECONDS) -> Optional[str]:
+    """
+    Returns the tag of the latest release saved by a previous check, or None if there is none or it has expired.
+    """
+    try:
+        with open(UPDATE_CHECK_CACHE_FILE_NAME, 'r', encoding='utf-8') as file:
+            cache = json.load(file)
+
+        latest_tag = cache['latestTag']
+
+        if isinstance(latest_tag, str) and 0 <= time.time() - cache['checkedAt'] < ttl_seconds:
+            return latest_tag
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    return None
+
+
+def save_cached_latest_tag(latest_tag: str):
+    try:
+        with open(UPDATE_CHECK_CACHE_FILE_NAME, 'w', encoding='utf-8') as file:
+            json.dump({'checkedAt': time.time(), 'latestTag': latest_tag}, file)
+    except OSError:
+        LOG.warning(f"Failed to save the result of the update check to `{UPDATE_CHECK_CACHE_FILE_NAME}`.")
+
+
+def check_new_version(use_cache: bool = False, url: str = API_UPDATE_URL) -> Optional[Union[str, bool]]:
     """
     Check the latest version by making a request to the update URL and comparing it with the current tag.
 
+    Args:
+        use_cache (bool): Whether a result of a previous check that has not expired can be used instead of a request.
+        url (str): The URL of the latest release in the format of the GitHub API.
+
     Returns:
         Optional[Union[str, False]]: The latest tag if it is greater than the current tag, False otherwise. None if an exception occurs.
     """
+    latest_tag = load_cached_latest_tag() if use_cache else None
+
+    if latest_tag is None:
+        latest_tag = fetch_latest_tag(url)
+
+        if latest_tag is None:
+            return None
+
+        save_cached_latest_tag(latest_tag)
+
     try:
-        with request.urlopen(API_UPDATE_URL) as response:
-            data = json.loads(response.read().decode())
-            latest_tag = data['tag_name']
-
-            if compare_version(latest_tag, CURRENT_TAG) > 0:
-                return latest_tag
-            else:
-                return False
-    except:
+        if compare_version(latest_tag, CURRENT_TAG) > 0:
+            return latest_tag
+        else:
+            return False
+    except (ValueError, TypeError, AttributeError):
         return None
 
 
 def check_updates(silent: bool = False):
-    new_version = check_new_version()
+    """
+    Checks for updates and offers to open the release page if a new version is available.
+
+    Args:
+        silent (bool): If True, the result is only reported when a new version is available, and the result of
+            a previous check is reused while it has not expired.
+    """
+    new_version = check_new_version(use_cache=silent)
 
     if new_version is None:
         if not silent:
@@ -43,3 +109,45 @@ def check_updates(silent: bool = False):
 
         if yesno_info_box(message):
             webbrowser.open(UPDATE_URL, new=0, autoraise=True)
+
+
+if __name__ == '__main__':
+    import os
+    import tempfile
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    # The stub reports a fake release, so its result is cached in a temporary directory rather than the app directory.
+    os.chdir(tempfile.mkdtemp())
+
+    # Checks for updates against a local stub of the releases API, including a server that does not respond in time.
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/slow':
+                time.sleep(UPDATE_CHECK_TIMEOUT_SECONDS + 1)
+                return
+
+            body = json.dumps({'tag_name': 'v999.0.0'}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    started_at = time.monotonic()
+    print(f"latest: {check_new_version(url=f'{base_url}/latest')}, {time.monotonic() - started_at:.2f} s")
+
+    started_at = time.monotonic()
+    print(f"cached: {check_new_version(use_cache=True, url=f'{base_url}/slow')}, {time.monotonic() - started_at:.2f} s")
+
+    started_at = time.monotonic()
+    print(f"slow: {check_new_version(url=f'{base_url}/slow')}, {time.monotonic() - started_at:.2f} s")
+
+    server.shutdown()